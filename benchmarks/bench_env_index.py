@@ -0,0 +1,61 @@
+"""
+Compare the nested-parameter lookup of load_config before and after the environment index.
+
+The old implementation scanned the whole (lowercased) environment once per parameter,
+the EnvIndex does a binary search per parameter, so the cost stops growing with env size x param count.
+
+Usage: python benchmarks/bench_env_index.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from load_config.env_index import EnvIndex
+
+
+def make_environ(n_vars, n_params):
+    environ = {f'UNRELATED_VAR_{i}': 'x' for i in range(n_vars)}
+    for i in range(n_params):
+        environ[f'PARAM{i}'] = 'value'
+        environ[f'PARAM{i}.KEY1'] = 'value1'
+        environ[f'PARAM{i}.KEY2'] = 'value2'
+    return environ
+
+
+def scan(environ, params):
+    os_environ_lower = {k.lower(): v for k, v in environ.items()}
+    config = {}
+    for param in params:
+        prefix = f'{param}.'
+        for k, v in os_environ_lower.items():
+            if k.startswith(prefix):
+                config.setdefault(param, {})[k[len(prefix):]] = v
+    return config
+
+
+def indexed(environ, params):
+    os_environ_lower = EnvIndex(environ)
+    config = {}
+    for param in params:
+        sub_params = os_environ_lower.nested(f'{param}.', separator='.')
+        if sub_params:
+            config[param] = sub_params
+    return config
+
+
+def main():
+    print(f"{'env vars':>10} {'params':>8} {'scan (ms)':>12} {'index (ms)':>12} {'speedup':>9}")
+    for n_vars in (100, 1000, 5000):
+        for n_params in (10, 100, 300):
+            environ = make_environ(n_vars, n_params)
+            params = [f'param{i}' for i in range(n_params)]
+            assert scan(environ, params) == indexed(environ, params)
+            number = 3
+            t_scan = min(timeit.repeat(lambda: scan(environ, params), number=number, repeat=3)) / number
+            t_index = min(timeit.repeat(lambda: indexed(environ, params), number=number, repeat=3)) / number
+            print(f'{n_vars:>10} {n_params:>8} {t_scan * 1000:>12.2f} {t_index * 1000:>12.2f} {t_scan / t_index:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
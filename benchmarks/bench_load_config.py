@@ -0,0 +1,232 @@
+"""
+Benchmark load_config across environment size, config file size and Azure mode.
+
+Synthetic environments and config files are generated locally (no network needed), and the time of each phase of
+loading a config is measured separately: reading the file, parsing it, lowercasing/indexing the environment,
+looking up the (nested) parameters in the environment and merging. The peak memory of parsing the file and of loading the parameters from the environment is measured with tracemalloc.
+
+Usage:
+    python benchmarks/bench_load_config.py                          # quick run
+    python benchmarks/bench_load_config.py --full                   # up to 50k env.vars and 50 MB files
+    python benchmarks/bench_load_config.py --output results.json    # save the results
+    python benchmarks/bench_load_config.py --baseline results.json  # compare with saved results, exit with 1 on regressions
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from load_config.loader import ConfigLoader
+from load_config.env_index import EnvIndex
+from load_config.parser import parse_config_text
+
+QUICK = {'env_sizes': [100, 1000, 5000], 'file_sizes': [1_000, 10_000, 100_000]}
+FULL = {'env_sizes': [100, 1000, 5000, 50_000], 'file_sizes': [1_000, 100_000, 1_000_000, 10_000_000, 50_000_000]}
+N_PARAMS = 300
+
+
+def make_environ(n_vars, azure):
+    """
+    An environment with n_vars variables, of which N_PARAMS are config parameters with two nested keys each.
+    """
+    environ = {}
+    prefix = 'APPSETTING_' if azure else ''
+    separator = '_' if azure else '.'
+    for i in range(min(N_PARAMS, n_vars // 3)):
+        environ[f'{prefix}PARAM{i}'] = f'value{i}'
+        environ[f'{prefix}PARAM{i}{separator}KEY1'] = f'value{i}_1'
+        environ[f'{prefix}PARAM{i}{separator}KEY2'] = f'value{i}_2'
+    i = 0
+    while len(environ) < n_vars:
+        environ[f'UNRELATED_VAR_{i}'] = 'x' * 20
+        i += 1
+    return environ
+
+
+def make_config_text(size, json5):
+    """
+    A config file of at most size bytes (and close to it): scalar parameters taking up to half of it (at most N_PARAMS),
+    plus a lookup table filling up the rest.
+    """
+    lines = []
+    for i in range(N_PARAMS):
+        if json5:
+            line = f'    // parameter {i}\n    param{i}: "file_value{i}",'
+        else:
+            line = f'    "param{i}": "file_value{i}",'
+        if sum(len(l) + 1 for l in lines) + len(line) > size // 2:
+            break
+        lines.append(line)
+    text = '\n'.join(lines)
+    if json5:
+        head, tail = '{\n' + text + '\n    lookup: {', '},\n}\n'
+    else:
+        head, tail = '{\n' + text + '\n    "lookup": {', '}\n}\n'
+    rows = []
+    length = len(head) + len(tail)
+    i = 0
+    while True:
+        row = f'"key{i:08d}": [{i}, "v{i:08d}"]'
+        if length + len(row) + 2 > size:
+            break
+        rows.append(row)
+        length += len(row) + 2
+        i += 1
+    return head + ',\n'.join(rows) + tail
+
+
+def timed(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def bench_file(config_file, repeat):
+    """
+    Time reading and parsing a config file (these phases don't depend on the environment, so they are measured once per file).
+    """
+    def read():
+        with open(config_file) as f:
+            return f.read()
+
+    seconds = {}
+    seconds['read'], text = timed(read, repeat)
+    seconds['parse'], parsed = timed(lambda: parse_config_text(text), repeat)
+    peak = peak_memory(lambda: parse_config_text(read()))
+    return seconds, {k.lower(): v for k, v in parsed.items()}, peak
+
+
+def bench_env(loader, environ, repeat):
+    """
+    Time indexing the environment and looking up the parameters in it.
+    """
+    seconds = {}
+    seconds['env_index'], env = timed(lambda: EnvIndex(environ), repeat)
+    seconds['env_lookup'], config_from_env = timed(lambda: loader._load_env(env, loader._is_azure(env)), repeat)
+    peak = peak_memory(lambda: loader._load_env(EnvIndex(environ), loader._is_azure(env)))
+    return seconds, config_from_env, peak
+
+
+def run(sizes, repeat, verbose=True):
+    results = {}
+    loaders = {
+        azure: ConfigLoader(required_config_params=[f'param{i}' for i in range(N_PARAMS)], azure_app_services=azure)
+        for azure in (False, True)
+    }
+    envs = {}
+    for env_size in sizes['env_sizes']:
+        for azure in (False, True):
+            envs[env_size, azure] = bench_env(loaders[azure], make_environ(env_size, azure), repeat)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for file_size in sizes['file_sizes']:
+            for json5 in (False, True):
+                config_file = os.path.join(tmp, f'config_{file_size}_{json5}.json')
+                with open(config_file, 'w') as f:
+                    f.write(make_config_text(file_size, json5))
+                # json5 is a pure Python parser, so large JSON5 files are only parsed once
+                file_bytes = os.path.getsize(config_file)
+                file_seconds, config_from_file, file_peak = bench_file(config_file, repeat if not json5 or file_size < 1_000_000 else 1)
+                for (env_size, azure), (env_seconds, config_from_env, env_peak) in envs.items():
+                    seconds = {**file_seconds, **env_seconds}
+                    seconds['merge'], _ = timed(lambda: {**config_from_file, **config_from_env}, repeat)
+                    seconds['total'] = sum(seconds.values())
+                    name = f"file={file_size}B format={'json5' if json5 else 'json'} env={env_size} azure={azure}"
+                    results[name] = {'seconds': seconds, 'peak_memory_bytes': {'file': file_peak, 'env': env_peak}, 'file_bytes': file_bytes}
+                    if verbose:
+                        print(f"{name:<55} size={file_bytes}B " + ' '.join(f"{k}={v * 1000:.2f}ms" for k, v in seconds.items())
+                              + f" peak={(file_peak + env_peak) / 1e6:.1f}MB", flush=True)
+    return results
+
+
+def best_of(results, other):
+    """
+    Combine the results of two runs, keeping the fastest time of each phase and the lowest peak memory of each case.
+    """
+    combined = {}
+    for name, result in results.items():
+        seconds = {k: min(v, other[name]['seconds'][k]) for k, v in result['seconds'].items() if k != 'total'}
+        seconds['total'] = sum(seconds.values())
+        peak = {k: min(v, other[name]['peak_memory_bytes'][k]) for k, v in result['peak_memory_bytes'].items()}
+        combined[name] = {**result, 'seconds': seconds, 'peak_memory_bytes': peak}
+    return combined
+
+
+def compare(results, baseline, threshold, min_seconds=0.001, min_bytes=65536):
+    """
+    Return the cases whose total time or peak memory grew by more than threshold (a ratio) compared to the baseline.
+
+    Small absolute differences are noise (the quick cases take about a millisecond), so a case only counts as a regression
+    if its time also grew by more than min_seconds, or its peak memory by more than min_bytes.
+
+    Returns:
+        list: A description of each regression.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        base = baseline[name]
+        for metric, value, base_value, min_delta, unit in (
+            ('total time', result['seconds']['total'], base['seconds']['total'], min_seconds, 's'),
+            ('peak memory', sum(result['peak_memory_bytes'].values()), sum(base['peak_memory_bytes'].values()), min_bytes, 'B'),
+        ):
+            if base_value and value / base_value > threshold and value - base_value > min_delta:
+                regressions.append(f"{name}: {metric} {value / base_value:.2f}x baseline (+{value - base_value:.6g}{unit})")
+    return regressions
+
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    args.add_argument('--full', action='store_true', help='also run the large environments and files')
+    args.add_argument('--repeat', type=int, default=5, help='number of repetitions per phase (the fastest is reported)')
+    args.add_argument('--output', help='write the results as JSON to this file')
+    args.add_argument('--baseline', help='compare with the results in this JSON file')
+    args.add_argument('--threshold', type=float, default=1.25, help='ratio to the baseline reported as a regression')
+    args.add_argument('--min-time', type=float, default=0.001, help='seconds a case must also get slower by to be reported (default: 0.001)')
+    args.add_argument('--min-memory', type=int, default=65536, help='bytes the peak memory must also grow by to be reported (default: 65536)')
+    args.add_argument('--confirm', type=int, default=2, help='times to measure again before reporting regressions (default: 2)')
+    args = args.parse_args()
+
+    sizes = FULL if args.full else QUICK
+    results = run(sizes, args.repeat)
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.min_time, args.min_memory)
+        # a slow moment of the machine can make a whole case slower, so measure again before reporting regressions,
+        # keeping the fastest time of each phase
+        for _ in range(args.confirm):
+            if not regressions:
+                break
+            print(f"measuring again to confirm {len(regressions)} regression(s)", flush=True)
+            results = best_of(results, run(sizes, args.repeat, verbose=False))
+            regressions = compare(results, baseline, args.threshold, args.min_time, args.min_memory)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1 +1,8 @@
-from .load_config import load_config
\ No newline at end of file
+from .load_config import load_config
+from .loader import ConfigLoader, MissingConfigParameterError
+from .watcher import ConfigWatcher
+from .lazy import LazyConfig
+from .aio import load_config_async
+from .shared import ConfigPublisher, SharedConfig
+from .batch import load_configs, LoadResult
+from .frozen import FrozenConfig, freeze
@@ -0,0 +1,35 @@
+"""
+Command line interface.
+
+Usage:
+    python -m load_config snapshot config.json   # pre-parse config.json into config.json.snapshot
+"""
+import sys
+import argparse
+from .parser import PARSERS
+from .snapshot import write_snapshot
+
+
+def main(argv=None):
+    args = argparse.ArgumentParser(prog='python -m load_config')
+    commands = args.add_subparsers(dest='command', required=True)
+    snapshot = commands.add_parser(
+        'snapshot',
+        help='validate and pre-parse config files into snapshots next to them, which load_config uses as long as the config file is unchanged',
+    )
+    snapshot.add_argument('config_files', nargs='+', metavar='config_file')
+    snapshot.add_argument('--parser', choices=PARSERS, default='auto', help='how to parse the config files (default: auto)')
+    args = args.parse_args(argv)
+
+    if args.command == 'snapshot':
+        for config_file in args.config_files:
+            try:
+                print(write_snapshot(config_file, args.parser))
+            except (OSError, ValueError) as e:
+                print(e, file=sys.stderr)
+                return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+import asyncio
+from .loader import ConfigLoader, _layer_cache
+from .executors import shared_executor
+
+
+async def load_config_async(
+        required_config_params=[],
+        load_from_env='required',
+        load_from_file='all',
+        config_file='config.json',
+        config_env_prefix='',
+        priority='env',
+        ignore_missing_file=False,
+        azure_app_services=False,
+        parser='auto',
+        on_event=None,
+        mmap_file=False,
+        secret_dirs=None,
+        frozen=False,
+        executor=None,
+        timeout=None
+    ):
+    """
+    Load the configuration parameters like load_config(), without blocking the event loop.
+
+    Reading and parsing the config file(s), reading the secret directories and loading the environment is done in a thread pool.
+    Layered config files (a list of config_file) are read and parsed concurrently.
+    The result and the priority rules are the same as for load_config().
+
+    If the coroutine is cancelled or times out, the config is not returned, but a file that is being read
+    in the thread pool at that moment is still read to the end (threads can't be interrupted).
+
+    Args:
+        See load_config(), and:
+        executor (concurrent.futures.Executor, optional): The executor to read and parse the files in.
+            Defaults to a shared thread pool of at most 8 threads.
+        timeout (float, optional): Seconds to wait for the config before raising asyncio.TimeoutError. Defaults to None (no timeout).
+
+    Returns:
+        dict: A dictionary containing the loaded configuration parameters.
+    """
+    loader = ConfigLoader(
+        required_config_params, load_from_env, load_from_file, config_file, config_env_prefix, priority,
+        ignore_missing_file, azure_app_services, parser, on_event=on_event, mmap_file=mmap_file, secret_dirs=secret_dirs, frozen=frozen,
+    )
+    return await asyncio.wait_for(_load(loader, executor or shared_executor('load_config')), timeout)
+
+
+async def _load(loader, executor):
+    loop = asyncio.get_running_loop()
+    if isinstance(loader.config_file, list):
+        # parse the layers concurrently; they end up in the layer cache, so loading below only merges them
+        await asyncio.gather(*(
+            loop.run_in_executor(executor, _layer_cache.get_layer, config_file, loader._parse_file, loader.parser, loader.ignore_missing_file)
+            for config_file in loader.config_file
+        ))
+    return await loop.run_in_executor(executor, loader.reload)
@@ -0,0 +1,70 @@
+import os
+from functools import partial
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from .loader import ConfigLoader
+from .env_index import EnvIndex
+
+LoadResult = namedtuple('LoadResult', ['config', 'error'])
+
+# the environment index shared by the configs loaded in a worker process, see _init_worker
+_worker_env = None
+
+
+def _init_worker(env):
+    global _worker_env
+    _worker_env = env
+
+
+def _load_in_worker(spec):
+    return _load_one(_worker_env, spec)
+
+
+def _load_one(env, spec):
+    try:
+        loader = ConfigLoader(**spec, raise_on_missing=True)
+        # secrets are read per loader, so configs with secret directories can't use the shared environment index
+        return LoadResult(loader._load(None if loader.secret_dirs else env), None)
+    except Exception as e:
+        return LoadResult(None, e)
+
+
+def load_configs(specs, workers=None, chunksize=None):
+    """
+    Load many configs at once, e.g. one per tenant, each with its own config file and config_env_prefix.
+
+    The environment is read and indexed once for the whole batch (instead of once per config), and the config files
+    are read and parsed in a pool of worker processes, which get the environment index once when they start and
+    then load the configs in chunks. A config that can't be loaded doesn't stop the others: its result contains
+    the error instead (e.g. FileNotFoundError, ValueError for invalid JSON, or MissingConfigParameterError).
+
+    Args:
+        specs (list): The configs to load, each a dict of load_config() arguments (except cache, lazy and on_event),
+            e.g. {'config_file': 'tenants/a/config.json', 'config_env_prefix': 'TENANT_A_'}.
+        workers (int, optional): Number of worker processes. With 1, the configs are loaded in the calling process.
+            Defaults to the number of CPUs.
+        chunksize (int, optional): Number of configs sent to a worker process at a time. Defaults to a quarter
+            of the configs per worker.
+
+    Returns:
+        list: A LoadResult(config, error) named tuple per spec, in the same order. config is None if loading failed,
+            error is None if it succeeded.
+
+    Example:
+        results = load_configs([{'config_file': f'tenants/{tenant}/config.json'} for tenant in tenants], workers=8)
+        for tenant, (config, error) in zip(tenants, results):
+            ...
+    """
+    specs = list(specs)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(specs)))
+    env = EnvIndex()
+
+    if workers == 1:
+        return list(map(partial(_load_one, env), specs))
+
+    if chunksize is None:
+        chunksize = max(1, len(specs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(env,)) as executor:
+        return list(executor.map(_load_in_worker, specs, chunksize=chunksize))
@@ -0,0 +1,146 @@
+import os
+import pickle
+import threading
+from collections import OrderedDict, namedtuple
+from collections.abc import Iterable
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+def file_fingerprint(path):
+    """
+    Return a cheap fingerprint of a file, used to detect if it has changed since it was last read.
+
+    Args:
+        path (str): Path to the file.
+
+    Returns:
+        tuple: (absolute path, mtime_ns, size, inode), or None if the file does not exist.
+    """
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    return (os.path.abspath(path), st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def config_file_fingerprint(config_file):
+    """
+    Return the fingerprint of a config file, or a tuple of fingerprints for a list of (layered) config files.
+    """
+    if isinstance(config_file, list):
+        return tuple(file_fingerprint(path) for path in config_file)
+    return file_fingerprint(config_file)
+
+
+def environ_fingerprint(prefixes=None):
+    """
+    Return a cheap fingerprint of the current OS environment, or of the variables that can affect a load_config() call.
+
+    Any change to the fingerprinted variables (added, removed or modified) gives a different fingerprint,
+    so cached configs are never served after a relevant variable has changed.
+
+    Args:
+        prefixes (iterable, optional): Only fingerprint the variables whose lower case name starts with one of these
+            (lower case) prefixes. Defaults to None (the whole environment).
+    """
+    if prefixes is None:
+        return hash(tuple(os.environ.items()))
+    prefixes = tuple(prefixes)
+    return hash(tuple((k, os.environ[k]) for k in os.environ if k.lower().startswith(prefixes)))
+
+
+def environ_prefixes(required_config_params, load_from_env, config_env_prefix):
+    """
+    Return the (lower case) prefixes of the environment variables that can affect a load_config() call,
+    or None if any variable can (load_from_env='all' without a config_env_prefix).
+    """
+    # Azure App Services is detected from the appsetting_ and website_ variables
+    prefixes = ['appsetting_', 'website_']
+    if config_env_prefix:
+        prefixes.append(config_env_prefix.lower())
+    elif load_from_env == 'all':
+        return None
+    else:
+        params = required_config_params if load_from_env == 'required' else load_from_env
+        # the part before the first dot also covers sub-parameters (PARAM.KEY) and Azure's PARAM_KEY
+        prefixes.extend(param.lower().split('.')[0] for param in params)
+    return prefixes
+
+
+def make_key(*args):
+    """
+    Build a hashable cache key from load_config arguments (sets are converted to frozensets,
+    and other iterables except strings to tuples).
+    """
+    return tuple(_hashable(a) for a in args)
+
+
+def _hashable(value):
+    if isinstance(value, (str, bytes)) or not isinstance(value, Iterable):
+        return value
+    if isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    return tuple(value)
+
+
+class ConfigCache:
+    """
+    A small thread safe LRU cache for loaded configs.
+
+    Callers can't corrupt cached entries by modifying the config they got back: dictionaries and lists are stored
+    pickled, and each get() returns a new copy unpickled from them (which is faster than copying the config, or even
+    parsing the config file). Immutable values such as FrozenConfig are stored and returned as they are.
+
+    Args:
+        maxsize (int, optional): Maximum number of cached configs. The least recently used config is evicted
+            when the cache is full. Defaults to 32.
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key):
+        """
+        Return a copy of the cached value for key, or None if it is not cached.
+        """
+        with self._lock:
+            if key not in self._entries:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            pickled, value = self._entries[key]
+        return pickle.loads(value) if pickled else value
+
+    def put(self, key, value):
+        """
+        Store a copy of value under key, evicting the least recently used entry if the cache is full.
+        """
+        pickled = isinstance(value, (dict, list))
+        value = (pickled, pickle.dumps(value, pickle.HIGHEST_PROTOCOL) if pickled else value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all cached entries and reset the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def info(self):
+        """
+        Return the cache statistics as a CacheInfo(hits, misses, maxsize, currsize) named tuple.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self.maxsize, len(self._entries))
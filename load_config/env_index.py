@@ -0,0 +1,87 @@
+import os
+from bisect import bisect_left
+
+
+class EnvIndex:
+    """
+    The OS environment, lowercased and indexed once so that lookups by prefix don't need to scan all variables.
+
+    The variable names are kept in a sorted list, so all variables starting with a given prefix are found with a
+    binary search followed by a scan of just the matching range.
+
+    Args:
+        environ (dict, optional): The environment to index. Defaults to os.environ.
+        secrets (dict, optional): Additional (lower case) variables read from secret files, overridden by environ.
+            The names of those that are not overridden are in `secrets`. Defaults to None.
+    """
+
+    def __init__(self, environ=None, secrets=None):
+        if environ is None:
+            environ = os.environ
+        self.vars = {k.lower(): v for k, v in environ.items()}
+        self.secrets = frozenset()
+        if secrets:
+            self.secrets = frozenset(k for k in secrets if k not in self.vars)
+            self.vars = {**secrets, **self.vars}
+        self.keys = sorted(self.vars)
+
+    def __contains__(self, key):
+        return key in self.vars
+
+    def __len__(self):
+        return len(self.vars)
+
+    def get(self, key, default=None):
+        return self.vars.get(key, default)
+
+    def has_prefix(self, prefix):
+        """
+        Return True if any variable name starts with prefix.
+        """
+        i = bisect_left(self.keys, prefix)
+        return i < len(self.keys) and self.keys[i].startswith(prefix)
+
+    def with_prefix(self, prefix):
+        """
+        Yield (name, value) for all variables whose name starts with prefix, in sorted order.
+        """
+        keys = self.keys
+        i = bisect_left(keys, prefix)
+        while i < len(keys) and keys[i].startswith(prefix):
+            yield keys[i], self.vars[keys[i]]
+            i += 1
+
+    def nested(self, prefix, separator=None, only=None):
+        """
+        Return the variables starting with prefix as a dictionary, with the prefix removed from the names.
+
+        If separator is given, the remaining names are split on it into nested dictionaries,
+        e.g. with prefix 'param.' and separator '.', PARAM.A.B=value results in {'a': {'b': 'value'}}.
+        If a name is both a value and a parent of other names (PARAM.A=x and PARAM.A.B=y), the nested keys win.
+
+        Args:
+            prefix (str): The (lower case) prefix to look for.
+            separator (str, optional): Separator between nesting levels. Defaults to None (no further nesting).
+            only (set, optional): Only include these variable names (e.g. `secrets`). Defaults to None (all variables).
+
+        Returns:
+            dict: The nested variables, or an empty dict if there are none.
+        """
+        result = {}
+        for k, v in self.with_prefix(prefix):
+            if only is not None and k not in only:
+                continue
+            name = k[len(prefix):]
+            if separator is None:
+                result[name] = v
+                continue
+            parts = name.split(separator)
+            node = result
+            for part in parts[:-1]:
+                child = node.get(part)
+                if not isinstance(child, dict):
+                    child = node[part] = {}
+                node = child
+            if not isinstance(node.get(parts[-1]), dict):
+                node[parts[-1]] = v
+        return result
@@ -0,0 +1,27 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+_executors = {}
+_lock = threading.Lock()
+
+
+def shared_executor(name):
+    """
+    Return the shared thread pool with the given name, creating it on first use.
+
+    The pools are small, so many concurrent loads can't start an unbounded number of threads. Each user has a pool of
+    its own, as the tasks of one (e.g. load_config_async) can wait for tasks of another (reading secret directories),
+    which could deadlock if they had to share the threads.
+
+    Args:
+        name (str): The name of the pool, also used as the prefix of its thread names.
+
+    Returns:
+        ThreadPoolExecutor: The thread pool.
+    """
+    with _lock:
+        executor = _executors.get(name)
+        if executor is None:
+            executor = _executors[name] = ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) + 4), thread_name_prefix=name)
+        return executor
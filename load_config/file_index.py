@@ -0,0 +1,159 @@
+import re
+import mmap
+from collections.abc import Mapping
+from .parser import parse_config_text
+
+# tokens of a JSON/JSON5 document, as far as needed to find where the top-level values start and end
+_WHITESPACE = re.compile(rb'(?:\s+|//[^\n]*|/\*.*?\*/)*', re.S)
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|\'[^\'\\]*(?:\\.[^\'\\]*)*\'', re.S)
+_IDENTIFIER = re.compile(rb'[A-Za-z_$][\w$]*')
+_SCALAR = re.compile(rb'[^,}\]\s/]+')
+_NESTED_TOKEN = re.compile(
+    rb'"[^"\\]*(?:\\.[^"\\]*)*"|\'[^\'\\]*(?:\\.[^\'\\]*)*\'|//[^\n]*|/\*.*?\*/|(?P<open>[\[{])|(?P<close>[\]}])',
+    re.S,
+)
+
+
+def _skip_whitespace(buf, pos):
+    return _WHITESPACE.match(buf, pos).end()
+
+
+def _expect(buf, pos, char):
+    if buf[pos:pos + 1] != char:
+        raise ValueError(f"Expected {char.decode()} at offset {pos}")
+    return pos + 1
+
+
+def _skip_value(buf, pos):
+    first = buf[pos:pos + 1]
+    if first in (b'{', b'['):
+        depth = 0
+        for m in _NESTED_TOKEN.finditer(buf, pos):
+            if m.lastgroup == 'open':
+                depth += 1
+            elif m.lastgroup == 'close':
+                depth -= 1
+                if depth == 0:
+                    return m.end()
+        raise ValueError(f"Unterminated value at offset {pos}")
+    m = (_STRING if first in (b'"', b"'") else _SCALAR).match(buf, pos)
+    if m is None:
+        raise ValueError(f"Unexpected value at offset {pos}")
+    return m.end()
+
+
+def index_top_level(buf):
+    """
+    Find the top-level keys of a JSON/JSON5 object and where their values are, in one scan and without parsing the values.
+
+    Args:
+        buf (bytes-like): The UTF-8 encoded document (e.g. a mmap of the config file).
+
+    Returns:
+        dict: {lower case key: (start, end)} byte offsets of the values. If a key occurs more than once, the last one wins.
+
+    Raises:
+        ValueError: If the document is not an object or uses syntax the scanner doesn't understand.
+    """
+    pos = 3 if buf[:3] == b'\xef\xbb\xbf' else 0 # skip a UTF-8 byte order mark
+    pos = _expect(buf, _skip_whitespace(buf, pos), b'{')
+    offsets = {}
+    while True:
+        pos = _skip_whitespace(buf, pos)
+        if buf[pos:pos + 1] == b'}': # empty object, or a trailing comma
+            pos += 1
+            break
+        m = _STRING.match(buf, pos) or _IDENTIFIER.match(buf, pos)
+        if m is None:
+            raise ValueError(f"Expected a key at offset {pos}")
+        key = m.group().decode('utf-8')
+        if key[0] in '"\'':
+            key = parse_config_text(key)
+        pos = _skip_whitespace(buf, _expect(buf, _skip_whitespace(buf, m.end()), b':'))
+        end = _skip_value(buf, pos)
+        offsets[key.lower()] = (pos, end)
+        pos = _skip_whitespace(buf, end)
+        if buf[pos:pos + 1] == b',':
+            pos += 1
+            continue
+        pos = _expect(buf, pos, b'}')
+        break
+    if _skip_whitespace(buf, pos) != len(buf):
+        raise ValueError("Unexpected content after the config object")
+    return offsets
+
+
+class FileIndex(Mapping):
+    """
+    A config file that is memory-mapped and indexed by its top-level keys, and only parses the values that are accessed.
+
+    The file is scanned once to find where each top-level value starts and ends, and values (sub-trees) are parsed
+    on first access, so large parts of the file that are not used (e.g. with load_from_file='required') are never
+    turned into Python objects. If the scanner doesn't understand the file, it is parsed as a whole instead
+    (which also gives the usual error messages if it's invalid), and so is a value that fails to parse.
+    With parser='json', the file is always parsed as a whole, as the scanner accepts JSON5 syntax and doesn't
+    validate the values it skips, so it couldn't reject JSON5 files.
+
+    Args:
+        config_file (str): Path to the config file.
+        parser (str, optional): The parser for the values, see load_config(). Defaults to 'auto'.
+        keys (set, optional): Only index these (lower case) keys. Defaults to None (all keys).
+
+    Raises:
+        FileNotFoundError: If the config file doesn't exist.
+        ValueError: If the config file is not valid JSON/JSON5.
+    """
+
+    def __init__(self, config_file, parser='auto', keys=None):
+        self.parser = parser
+        self._values = {}
+        with open(config_file, 'rb') as f:
+            try:
+                self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError: # empty files can't be mapped
+                self._buf = b''
+        self._offsets = None
+        if parser != 'json':
+            try:
+                self._offsets = index_top_level(self._buf)
+            except ValueError:
+                pass
+        if self._offsets is None:
+            self._values = self._parse_all()
+            self._offsets = dict.fromkeys(self._values)
+        if keys is not None:
+            self._offsets = {k: v for k, v in self._offsets.items() if k in keys}
+            self._values = {k: v for k, v in self._values.items() if k in keys}
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            start, end = self._offsets[key]
+            try:
+                value = parse_config_text(self._buf[start:end].decode('utf-8'), self.parser)
+            except ValueError:
+                # parse the whole file, for an error message with the position in the file (as without mmap_file)
+                value = self._parse_all()[key]
+            self._values[key] = value
+            return value
+
+    def _parse_all(self):
+        config = parse_config_text(bytes(self._buf).decode('utf-8'), self.parser)
+        return {k.lower(): v for k, v in config.items()}
+
+    def __contains__(self, key):
+        return key in self._offsets
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def close(self):
+        """
+        Release the memory map. Values that have not been accessed before can't be parsed afterwards.
+        """
+        if isinstance(self._buf, mmap.mmap):
+            self._buf.close()
@@ -0,0 +1,193 @@
+import sys
+from collections.abc import Mapping
+
+_MISSING = object()
+
+
+class FrozenConfig(Mapping):
+    """
+    An immutable, hashable config (or nested sub-parameter dictionary).
+
+    Nested dictionaries are FrozenConfig nodes as well, lists become tuples, and the keys are interned.
+    The hash is computed once, from the hashes of the nodes below, so hashing a config and comparing it with a config
+    that has a different hash is O(1). Copying a FrozenConfig (copy.copy, copy.deepcopy) returns the same object.
+
+    Configs frozen with freeze(config, previous) share the unchanged nodes with the previous config, so comparing
+    or diffing them (see diff()) only looks at the parts that changed, and an unchanged config is the previous object.
+
+    Args:
+        mapping (dict or Mapping, optional): The config to freeze. Defaults to an empty config.
+    """
+
+    __slots__ = ('_items', '_hash')
+
+    def __new__(cls, mapping=()):
+        # built in __new__ (there's no __init__), so an existing instance can't be initialized again
+        items = {}
+        for k, v in dict(mapping).items():
+            items[sys.intern(k) if type(k) is str else k] = _freeze(v, _MISSING)
+        return cls._new(items)
+
+    @classmethod
+    def _new(cls, items):
+        # build a node from already frozen values and interned keys
+        node = object.__new__(cls)
+        node._init(items)
+        return node
+
+    def _init(self, items):
+        if hasattr(self, '_items'):
+            raise AttributeError("FrozenConfig is immutable")
+        object.__setattr__(self, '_items', items)
+        object.__setattr__(self, '_hash', hash(frozenset(items.items())))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenConfig is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("FrozenConfig is immutable")
+
+    def __getitem__(self, key):
+        return self._items[key]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def get(self, key, default=None):
+        return self._items.get(key, default)
+
+    def keys(self):
+        return self._items.keys()
+
+    def items(self):
+        return self._items.items()
+
+    def values(self):
+        return self._items.values()
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, FrozenConfig):
+            # identical sub-trees are skipped by the dict comparison, so shared nodes are not compared again
+            return self._hash == other._hash and self._items == other._items
+        if isinstance(other, Mapping):
+            return self.thaw() == _thaw(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"FrozenConfig({self._items!r})"
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (FrozenConfig, (self._items,))
+
+    def thaw(self):
+        """
+        Return a mutable copy of the config, with dictionaries and lists like load_config() returns.
+        """
+        return _thaw(self)
+
+    def diff(self, other):
+        """
+        Return the paths of the values that were added, removed or changed between this config and other.
+
+        Identical nodes (shared by freeze(config, previous)) are skipped without looking inside them, so diffing two
+        versions of a config frozen that way only visits the keys of the nodes on the paths to the changes, not the
+        whole config. Like freeze(), values of different types (e.g. 1 and true) are different.
+
+        Args:
+            other (FrozenConfig): The other config.
+
+        Returns:
+            set: Tuples of keys, e.g. {('db', 'host'), ('param1',)}.
+        """
+        changed = set()
+        _diff(self, other, (), changed)
+        return changed
+
+
+def _diff(old, new, path, changed):
+    old_items, new_items = old._items, new._items
+    removed = 0
+    for k, a in old_items.items():
+        b = new_items.get(k, _MISSING)
+        if a is b:
+            continue
+        if b is _MISSING:
+            removed += 1
+            changed.add(path + (k,))
+        elif isinstance(a, FrozenConfig) and isinstance(b, FrozenConfig):
+            _diff(a, b, path + (k,), changed)
+        elif type(a) is not type(b) or a != b:
+            changed.add(path + (k,))
+    if len(new_items) > len(old_items) - removed: # there are added keys
+        changed.update(path + (k,) for k in new_items.keys() - old_items.keys())
+
+
+def freeze(config, previous=None):
+    """
+    Return a FrozenConfig of a config.
+
+    If the previous version of the config is given, the nodes (and values) that are unchanged are taken from it,
+    so they are shared between both versions, and if nothing changed, previous itself is returned. Values are only
+    considered unchanged if they have the same type, so e.g. changing 1 to true or 1.0 is a change.
+
+    Args:
+        config (dict or Mapping): The config.
+        previous (FrozenConfig, optional): The previous version of the config. Defaults to None.
+
+    Returns:
+        FrozenConfig: The frozen config.
+    """
+    return _freeze(config, _MISSING if previous is None else previous)
+
+
+def _freeze(value, previous):
+    if isinstance(value, Mapping):
+        if isinstance(value, FrozenConfig) and previous is _MISSING:
+            return value
+        previous_items = previous._items if isinstance(previous, FrozenConfig) else None
+        unchanged = previous_items is not None and len(previous_items) == len(value)
+        items = {}
+        for k, v in value.items():
+            if type(k) is str:
+                k = sys.intern(k)
+            previous_value = _MISSING if previous_items is None else previous_items.get(k, _MISSING)
+            frozen = items[k] = _freeze(v, previous_value)
+            unchanged = unchanged and frozen is previous_value
+        return previous if unchanged else FrozenConfig._new(items)
+    if isinstance(value, (list, tuple)):
+        previous_values = previous if type(previous) is tuple else ()
+        frozen = tuple(
+            _freeze(v, previous_values[i] if i < len(previous_values) else _MISSING)
+            for i, v in enumerate(value)
+        )
+        if type(previous) is tuple and len(frozen) == len(previous) and all(a is b for a, b in zip(frozen, previous)):
+            return previous
+        return frozen
+    if previous is not _MISSING and type(previous) is type(value) and previous == value:
+        return previous
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw(v) for v in value]
+    return value
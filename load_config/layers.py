@@ -0,0 +1,118 @@
+import threading
+from collections import OrderedDict
+from .cache import file_fingerprint
+
+
+def deep_merge(base, override):
+    """
+    Merge two configs: dictionaries are merged recursively, other values in override replace those in base.
+
+    Neither config is modified. Sub-trees of base that are not overridden are shared with the result instead of copied,
+    so merging is proportional to the size of override, not of base.
+    """
+    if not override:
+        return base
+    merged = dict(base)
+    for k, v in override.items():
+        if isinstance(v, dict) and isinstance(merged.get(k), dict):
+            merged[k] = deep_merge(merged[k], v)
+        else:
+            merged[k] = v
+    return merged
+
+
+def copy_tree(value):
+    """
+    Copy the dictionaries and lists of a parsed config (the other values are immutable).
+    """
+    if isinstance(value, dict):
+        return {k: copy_tree(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [copy_tree(v) for v in value]
+    return value
+
+
+class LayerCache:
+    """
+    Caches the parsed layers of a layered config, and the results of merging them.
+
+    Each layer (config file) is cached by its (path, mtime_ns, size, inode) and the parser, so when one file of
+    the stack changes, only that file is parsed again. The merge results are cached by the layers they are made of,
+    so the layers before the changed one are not merged again either, and merging in the changed layer only
+    touches the sub-trees it contains (see deep_merge). The cached configs are shared, so they must not be modified.
+
+    Args:
+        maxsize (int, optional): Maximum number of cached layers and of cached merge results. Defaults to 64.
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self._layers = OrderedDict()
+        self._merges = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, entries, key):
+        with self._lock:
+            value = entries.get(key)
+            if value is not None:
+                entries.move_to_end(key)
+            return value
+
+    def _put(self, entries, key, value):
+        with self._lock:
+            entries[key] = value
+            entries.move_to_end(key)
+            while len(entries) > self.maxsize:
+                entries.popitem(last=False)
+
+    def get_layer(self, config_file, parse, parser, ignore_missing_file=False):
+        """
+        Return (cache key, parsed config file), parsing the file only if it's not cached or has changed.
+        The parsed config file is None if the file doesn't exist and ignore_missing_file is True.
+        """
+        fingerprint = file_fingerprint(config_file)
+        if fingerprint is None:
+            if ignore_missing_file:
+                return None, None
+            raise FileNotFoundError(f"Config file not found: {config_file}")
+        layer_key = (fingerprint, parser)
+        layer = self._get(self._layers, layer_key)
+        if layer is None:
+            try:
+                layer = parse(config_file)
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Config file not found: {config_file}")
+            self._put(self._layers, layer_key, layer)
+        return layer_key, layer
+
+    def load(self, config_files, parse, parser, ignore_missing_file=False):
+        """
+        Load and merge a stack of config files, later files overriding earlier ones.
+
+        Args:
+            config_files (list): Paths of the config files.
+            parse (callable): parse(config_file) returns the parsed config file with lower case top-level keys.
+            parser (str): The parser used by parse, part of the cache key.
+            ignore_missing_file (bool, optional): Whether to skip config files that don't exist. Defaults to False.
+
+        Returns:
+            dict: The merged config (shared with the cache, so it must not be modified).
+        """
+        merged = {}
+        key = ()
+        for config_file in config_files:
+            layer_key, layer = self.get_layer(config_file, parse, parser, ignore_missing_file)
+            if layer is None:
+                continue
+            key += (layer_key,)
+            cached = self._get(self._merges, key)
+            if cached is None:
+                cached = deep_merge(merged, layer)
+                self._put(self._merges, key, cached)
+            merged = cached
+        return merged
+
+    def clear(self):
+        with self._lock:
+            self._layers.clear()
+            self._merges.clear()
@@ -0,0 +1,120 @@
+from collections.abc import Mapping
+from .loader import _MISSING
+from .layers import deep_merge
+
+
+class LazyConfig(Mapping):
+    """
+    A read-only config that loads each parameter on first access, returned by load_config(lazy=True).
+
+    A parameter is resolved from the environment and/or the config file following the same priority and
+    Azure App Services rules as load_config(), and remembered, so it's only resolved once.
+    The config file is only read and parsed when a parameter is needed from it
+    (e.g. not at all if priority='env' and all the accessed parameters are set in the environment),
+    and with mmap_file=True only the values of the accessed parameters are parsed.
+    Iterating over the config (or taking its len()) needs all the parameter names, so it resolves the environment
+    and reads the config file.
+
+    Args:
+        loader (ConfigLoader): The loader with the load_config() arguments.
+        env (EnvIndex): The indexed environment.
+    """
+
+    def __init__(self, loader, env):
+        self._loader = loader
+        self._env = env
+        self._azure = loader._is_azure(env)
+        self._lookups = loader._azure_env_lookups if self._azure else loader._env_lookups
+        self._config_from_file = None
+        self._values = {}
+        self._env_values = {}
+        self._keys = None
+
+    def _file_config(self):
+        if self._config_from_file is None:
+            self._config_from_file = self._loader._read_file(lazy=True)
+        return self._config_from_file
+
+    def _file_value(self, key):
+        config_from_file = self._file_config()
+        try:
+            return config_from_file.get(key, _MISSING)
+        except ValueError as e: # with mmap_file, the values are parsed when they are accessed
+            raise ValueError(f"Invalid JSON in config file: {self._loader.config_file}: {e}")
+
+    def _env_value(self, key):
+        try:
+            return self._env_values[key]
+        except KeyError:
+            value = self._env_values[key] = self._resolve_env(key)
+            return value
+
+    def _resolve_env(self, key):
+        loader = self._loader
+        if loader.load_from_env == 'all':
+            # the env.vars are already in the correct format, no lookup of Azure names needed
+            env_var = f"{loader.config_env_prefix}{key}"
+            if env_var not in self._env:
+                return _MISSING
+            return loader._resolve_env(self._env, loader._env_lookup(key, self._azure, all_env=True), self._env.get(env_var))
+        lookup = self._lookups.get(key)
+        if lookup is None:
+            return _MISSING
+        return loader._resolve_env(self._env, lookup)
+
+    def _resolve(self, key):
+        if self._loader.priority == 'env':
+            first, second = self._env_value, self._file_value
+        else:
+            first, second = self._file_value, self._env_value
+        value = first(key)
+        if value is _MISSING:
+            return second(key)
+        if isinstance(value, dict) and isinstance(self._loader.config_file, list):
+            # merged into layered config files recursively, as by load_config()
+            base = second(key)
+            if isinstance(base, dict):
+                return deep_merge(base, value)
+        return value
+
+    def __getitem__(self, key):
+        try:
+            value = self._values[key]
+        except KeyError:
+            value = self._values[key] = self._resolve(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def _env_keys(self):
+        if self._loader.load_from_env == 'all':
+            prefix = self._loader.config_env_prefix
+            return [k[len(prefix):] for k, _ in self._env.with_prefix(prefix)]
+        return [k for k in self._lookups if self._env_value(k) is not _MISSING]
+
+    def __iter__(self):
+        if self._keys is None:
+            # same order as the dict returned by load_config()
+            if self._loader.priority == 'env':
+                keys = dict.fromkeys(self._file_config())
+                keys.update(dict.fromkeys(self._env_keys()))
+            else:
+                keys = dict.fromkeys(self._env_keys())
+                keys.update(dict.fromkeys(self._file_config()))
+            self._keys = list(keys)
+        return iter(self._keys)
+
+    def __len__(self):
+        if self._keys is None:
+            iter(self)
+        return len(self._keys)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
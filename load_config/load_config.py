@@ -1,5 +1,8 @@
-import os
-import json5
+from .cache import ConfigCache, config_file_fingerprint, environ_fingerprint, environ_prefixes, make_key
+from .loader import ConfigLoader
+from .secret_dirs import secret_dirs_fingerprint
+
+_config_cache = ConfigCache()
 
 def load_config(
         required_config_params=[],
@@ -9,7 +12,14 @@ def load_config(
         config_env_prefix='',
         priority='env',
         ignore_missing_file=False,
-        azure_app_services=False
+        azure_app_services=False,
+        cache=False,
+        parser='auto',
+        lazy=False,
+        on_event=None,
+        mmap_file=False,
+        secret_dirs=None,
+        frozen=False
     ):
     """
     Load the configuration parameters from environment variables and a config file.
@@ -20,149 +30,73 @@ def load_config(
             Possible values are 'required', 'all', or a list of environment variable names. Defaults to 'required'.
         load_from_file (str, optional): Determines which parameters to load from the config file. 
             Possible values are 'required', 'all', or a list of config file keys. Defaults to 'all'.
-        config_file (str, optional): Path to the config file. Defaults to 'config.json'.
+        config_file (str or list, optional): Path to the config file, or a list of paths to layered config files (e.g. base, region
+            and environment specific overrides), where later files override earlier ones. Layered config files are merged
+            recursively (nested dictionaries are merged, not replaced), and so are the environment variables on top of them.
+            Each file is cached, so it's only parsed again when it has changed. mmap_file is not used for layered config files.
+            Defaults to 'config.json'.
         config_env_prefix (str, optional): Prefix to be added to the environment variable names. Defaults to ''.
         env_vars_are_upper_case (bool, optional): Whether the environment variables are in upper case. Defaults to True. If false, the environment variables are expected to be in the same case as the config file keys.
         priority (str, optional): Determines the priority of merging the config from environment and config file. 
             Possible values are 'env' or 'file'. Defaults to 'env'.
         ignore_missing_file (bool, optional): Whether to ignore if the config file is missing. Defaults to False.
         azure_app_services (bool, optional): Whether to treat the environment as an Azure App Service environment. Defaults to False, but will be set to True if the environment variables 'WEBSITE_SITE_NAME' and 'WEBSITE_RESOURCE_GROUP' are present, as this indicates that the code is running in an Azure App Service environment.
+        cache (bool, optional): Whether to memoize the result. Cached configs are keyed by the arguments, the config file's
+            (path, mtime_ns, size, inode) and a fingerprint of the environment variables that can affect the config (those starting
+            with config_env_prefix or a loaded parameter name, and Azure's APPSETTING_ and WEBSITE_ variables; the whole environment
+            with load_from_env='all' and no config_env_prefix), so they are reloaded when either changes.
+            Each call returns its own copy of the config. Use load_config.cache_clear() and load_config.cache_info()
+            to manage the cache. Defaults to False.
+        parser (str, optional): How to parse the config file. 'auto' tries a fast strict JSON parser (orjson if installed) first
+            and only falls back to json5 if the file uses JSON5 syntax, 'json' only accepts strict JSON and 'json5' always uses json5.
+            Defaults to 'auto'.
+        lazy (bool, optional): Whether to return a read-only Mapping that loads each parameter on first access, instead of loading
+            all of them up front (the config file is only read when a parameter is needed from it). The required parameters
+            are still checked immediately. Can't be combined with cache. Defaults to False.
+        on_event (callable, optional): Instrumentation hook, called as on_event(event, data) with the time of each phase of loading
+            ('read', 'parse', 'secrets', 'env_index', 'env_lookup', 'merge', with data['seconds']; 'snapshot' instead of 'read' and 'parse'
+            when a config snapshot is used, and 'index' instead of 'read' with mmap_file) and finally with 'loaded', where data contains
+            counts ('env_vars_scanned', 'keys_loaded', 'nested_keys') and 'provenance': {key: 'env', 'azure', 'secret' or 'file'}, telling
+            where each parameter came from. Not called when the config is served from the cache. Defaults to None.
+        mmap_file (bool, optional): Whether to memory-map the config file and only parse the values of the keys that are loaded
+            from it (or, with lazy=True, that are accessed), instead of parsing the whole file. Saves time and memory for large
+            config files with load_from_file='required' or a list of keys. With parser='json', the whole file is parsed (strictly). Defaults to False.
+        secret_dirs (str or list, optional): Key-per-file secret directories (e.g. Kubernetes secret volumes or Docker's /run/secrets),
+            where each file name is a parameter name and the file contains its value. The files are named without config_env_prefix:
+            the file db.password is loaded like the environment variable {config_env_prefix}DB.PASSWORD would be (subject to
+            load_from_env), so dotted file names result in nested dictionaries, also on Azure App Services. Environment variables
+            override secrets, and later directories override earlier ones.
+            Each directory is cached by its mtime, inode and `..data` symlink target, so it's only read again when it has changed.
+            Directories that don't exist are ignored. Defaults to None.
+        frozen (bool, optional): Whether to return an immutable, hashable FrozenConfig (nested dictionaries are FrozenConfigs
+            and lists are tuples) instead of a dict. With cache=True, cached FrozenConfigs are returned without copying them.
+            Can't be combined with lazy. Defaults to False.
 
     Notes:
+        - To load the same configuration repeatedly, use ConfigLoader, which takes the same arguments (except cache).
         - The environment variables are expected to be in upper case.
         - The config file should be a JSON file with the configuration parameters as key-value pairs.
 
     Returns:
-        dict: A dictionary containing the loaded configuration parameters.
+        dict: A dictionary containing the loaded configuration parameters (a LazyConfig Mapping if lazy is True,
+            a FrozenConfig if frozen is True).
     """
-
-    config_from_env = {}
-    config_from_file = {}
-
-    # Load the configuration file
-    try:
-        with open(config_file) as f:
-            config_from_file = json5.load(f)
-            config_from_file = {k.lower(): v for k, v in config_from_file.items()} # Convert all keys to lower case
-    except FileNotFoundError:
-        if not ignore_missing_file:
-            raise FileNotFoundError(f"Config file not found: {config_file}")
-    except ValueError as e:
-        raise ValueError(f"Invalid JSON in config file: {config_file}: {e}")
-
-    # Convert all keys to lower case
-    required_config_params = [param.lower() for param in required_config_params]
-    os_environ_lower = {k.lower(): v for k, v in os.environ.items()}
-    config_env_prefix = config_env_prefix.lower()
-
-    # detect if we're in an azure app service environment
-    if (
-        'website_site_name' in os_environ_lower
-        or "website_resource_group" in os_environ_lower
-        or 'website_instance_id' in os_environ_lower
-        or any(k.startswith('appsetting_') for k in os_environ_lower)
-    ):
-        azure_app_services = True
-
-    # determine which parameters to load from environment variables
-    if load_from_env == 'required':
-        params_to_load_from_env = {k.lower() for k in required_config_params}
-    elif load_from_env == 'all':
-        params_to_load_from_env = {k[len(config_env_prefix):] for k in os_environ_lower.keys() if k.startswith(config_env_prefix)}
-    elif type(load_from_env) == list:
-        params_to_load_from_env = load_from_env
-    else:
-        raise ValueError("load_from_env must be 'required', 'all', or a list of environment variable names")
-
-    if load_from_env == 'all':
-        # filter out the env.vars that do not start with the config_env_prefix and remove the prefix from the ones that do
-        config_from_env = {k[len(config_env_prefix):]: v for k, v in os_environ_lower.items() if k.startswith(config_env_prefix) and k[len(config_env_prefix):] in params_to_load_from_env}
-    else:
-        # if we're in an azure app service environment, we need to convert dots to underscores in the environment variables
-        # unless we got the env.vars from the environment (load_from_env == 'all'), as they are already in the correct format
-        if azure_app_services:
-            params_to_load_from_env = {k.replace('.', '_') for k in params_to_load_from_env}
-
-    # determine which parameters to load from the config file
-    if load_from_file == 'required':
-        params_to_load_from_file = required_config_params
-    elif load_from_file == 'all':
-        params_to_load_from_file = config_from_file.keys()
-    elif type(load_from_file) == list:
-        params_to_load_from_file = load_from_file
-    else:
-        raise ValueError("load_from_file must be 'required', 'all', or a list of config file keys")
-
-    # filter out the config parameters that are not in the list of parameters to load from the file
-    for param in config_from_file.copy():
-        if param not in params_to_load_from_file:
-            del config_from_file[param]
-
-    # get all required config parameters from environment variables
-    # Note about Azure App Services: 
-    # Azure converts dots to underscores in environment variables and adds a prefix (in addition to keeping the original name as well -- although still with underscores instead of dots)
-    # This applies to all settings in Azure App Services / Configuration / Application Settings -- but not system environment variables
-    for param in params_to_load_from_env:
-        env_var_to_lookup = f"{config_env_prefix}{param}"
-        env_var_to_lookup_in_azure = f"appsetting_{env_var_to_lookup}" # azure app services prefix
-        
-        # if we're in an azure app service environment and the env.var with the prefix is set, then load it
-        if azure_app_services and not load_from_env == 'all' and env_var_to_lookup_in_azure in os_environ_lower:
-            config_from_env[param] = os_environ_lower.get(f"appsetting_{env_var_to_lookup}")
-
-        # if we're not in an azure app service environment, then just load the env.var without the prefix
-        # also if we're in an azure app service environment and the env.var with the prefix is not set, then try to get the env.var without the prefix, as this applies to system environment variables
-        if env_var_to_lookup in os_environ_lower:
-            if not config_from_env.get(param):
-                config_from_env[param] = os_environ_lower.get(env_var_to_lookup)
-
-        # check if there are any sub-parameters for this parameter and load them as a dictionary
-        if azure_app_services:
-            prefix = f"{env_var_to_lookup_in_azure}_"
-        else:
-            prefix = f"{env_var_to_lookup}." # all other places than Azure App Services (as far as we know)
-        # if there are env.vars that start with param and a dot, then load them as a dictionary
-        # e.g. PREFIX_PARAM1.KEY1=value1, PREFIX_PARAM1.KEY2=value2
-        # results in: config['param1'] = {'key1': 'value1', 'key2': 'value2'}
-        for k, v in os_environ_lower.items():
-            if k.startswith(prefix):
-                # Azure can expose both PARAM and PARAM_KEY values; nested keys win for object-like params.
-                if not isinstance(config_from_env.get(param), dict):
-                    config_from_env[param] = {}
-                config_from_env[param][k[len(prefix):].lower()] = v
-
-    # if there are dots in the required config parameters, they now have underscores if they are from Azure App Services environment variables
-    # example:
-    # config_from_env  = {'param127_key2': 'env_value2', 'param127_key1': 'env_value1'}
-    # config_from_file = {'param127.key1': 'file_value1', 'param127.key2': 'file_value2'}
-    # convert them back to dots (but not ALL, just the underscores that used to be a dot)
-    if azure_app_services:
-        if load_from_env == 'required':
-            env_vars_to_convert = required_config_params
-        elif type(load_from_env) == list:
-            env_vars_to_convert = load_from_env
-        else:
-            env_vars_to_convert = []
-        for param in env_vars_to_convert:
-            # if the parameter, with dots converted to underscores, is in the environment variables, then convert it back to dots
-            if param.replace('.', '_') in config_from_env:
-                config_from_env[param] = config_from_env.pop(param.replace('.', '_'))
-        # now the environment variables are back to the original format 
-        # (with dots instead of underscores if specified in the config file)
-        # so we can merge the environment variables and the config file
-
-    # Merge the config from the environment and the config file
-    if priority == 'env':
-        config = {**config_from_file, **config_from_env}
-    elif priority == 'file':
-        config = {**config_from_env, **config_from_file}
-    else:
-        raise ValueError("priority must be 'env' or 'file'")
-
-    # Check that all required config parameters are present
-    for param in required_config_params:
-        if param not in config:
-            print(f"Missing required config parameter: {param}. It can be set either as an environment variable (as {param.upper()}) or in {config_file} (as {param}).")
-            exit(1)
-
+    args = (required_config_params, load_from_env, load_from_file, config_file, config_env_prefix, priority, ignore_missing_file, azure_app_services, parser)
+    if lazy:
+        if cache:
+            raise ValueError("cache and lazy can't be combined")
+        if frozen:
+            raise ValueError("frozen and lazy can't be combined")
+        return ConfigLoader(*args, on_event=on_event, mmap_file=mmap_file, secret_dirs=secret_dirs, frozen=frozen).load_lazy()
+    if not cache:
+        return ConfigLoader(*args, on_event=on_event, mmap_file=mmap_file, secret_dirs=secret_dirs, frozen=frozen).load()
+
+    key = make_key(*args, config_file_fingerprint(config_file), environ_fingerprint(environ_prefixes(required_config_params, load_from_env, config_env_prefix)), secret_dirs_fingerprint(secret_dirs), frozen)
+    config = _config_cache.get(key)
+    if config is None:
+        config = ConfigLoader(*args, on_event=on_event, mmap_file=mmap_file, secret_dirs=secret_dirs, frozen=frozen).load()
+        _config_cache.put(key, config)
     return config
+
+load_config.cache_clear = _config_cache.clear
+load_config.cache_info = _config_cache.info
@@ -0,0 +1,441 @@
+import os
+from time import perf_counter
+from .parser import PARSERS, parse_config_text
+from .snapshot import snapshot_path, read_snapshot
+from .file_index import FileIndex
+from .layers import LayerCache, copy_tree, deep_merge
+from .env_index import EnvIndex
+from .cache import file_fingerprint
+from .secret_dirs import SecretDirCache
+from .frozen import freeze
+
+_MISSING = object()
+
+_layer_cache = LayerCache()
+_secret_cache = SecretDirCache()
+
+
+class MissingConfigParameterError(Exception):
+    """
+    Raised by ConfigLoader(raise_on_missing=True) if a required config parameter is missing.
+
+    Attributes:
+        param (str): The (lower case) name of the missing parameter.
+    """
+
+    def __init__(self, message, param=None):
+        super().__init__(message)
+        self.param = param
+
+
+class ConfigLoader:
+    """
+    A compiled load_config() call, for loading the same configuration repeatedly.
+
+    All the work that only depends on the arguments (lowercasing the parameter names, resolving the load_from_env and
+    load_from_file modes, building the Azure dotted/underscore mappings and the env.var names to look up) is done once here,
+    so load() and reload() only read the environment and the config file and merge them.
+
+    Args:
+        See load_config(), and:
+        raise_on_missing (bool, optional): Whether to raise MissingConfigParameterError if a required parameter is missing,
+            instead of printing a message and exiting. Defaults to False.
+
+    Example:
+        loader = ConfigLoader(required_config_params=["param"])
+        config = loader.load()
+        ...
+        config = loader.reload() # picks up changes to the environment and the config file
+    """
+
+    def __init__(
+            self,
+            required_config_params=[],
+            load_from_env='required',
+            load_from_file='all',
+            config_file='config.json',
+            config_env_prefix='',
+            priority='env',
+            ignore_missing_file=False,
+            azure_app_services=False,
+            parser='auto',
+            on_event=None,
+            mmap_file=False,
+            secret_dirs=None,
+            frozen=False,
+            raise_on_missing=False
+        ):
+        if not (load_from_env in ('required', 'all') or type(load_from_env) == list):
+            raise ValueError("load_from_env must be 'required', 'all', or a list of environment variable names")
+        if not (load_from_file in ('required', 'all') or type(load_from_file) == list):
+            raise ValueError("load_from_file must be 'required', 'all', or a list of config file keys")
+        if priority not in ('env', 'file'):
+            raise ValueError("priority must be 'env' or 'file'")
+        if parser not in PARSERS:
+            raise ValueError("parser must be 'auto', 'json' or 'json5'")
+
+        self.required_config_params = [param.lower() for param in required_config_params]
+        self.load_from_env = load_from_env
+        self.load_from_file = load_from_file
+        self.config_file = config_file
+        self.config_env_prefix = config_env_prefix.lower()
+        self.priority = priority
+        self.ignore_missing_file = ignore_missing_file
+        self.azure_app_services = azure_app_services
+        self.parser = parser
+        self.on_event = on_event
+        self.mmap_file = mmap_file
+        self.secret_dirs = [secret_dirs] if isinstance(secret_dirs, (str, os.PathLike)) else list(secret_dirs or [])
+        self.frozen = frozen
+        self.raise_on_missing = raise_on_missing
+        self.config = None
+
+        # determine which parameters to load from the config file (None means all)
+        if load_from_file == 'required':
+            self._params_to_load_from_file = set(self.required_config_params)
+        elif load_from_file == 'all':
+            self._params_to_load_from_file = None
+        else:
+            self._params_to_load_from_file = set(load_from_file)
+
+        # determine which parameters to load from environment variables, and the env.var names to look them up by.
+        # with load_from_env='all' the parameters depend on the environment, so they are looked up when loading
+        if load_from_env == 'required':
+            params_to_load_from_env = list(dict.fromkeys(self.required_config_params))
+            env_vars_to_convert = self.required_config_params
+        elif load_from_env == 'all':
+            params_to_load_from_env = []
+            env_vars_to_convert = []
+        else:
+            params_to_load_from_env = list(dict.fromkeys(load_from_env))
+            env_vars_to_convert = load_from_env
+        self._env_lookups = {param: self._env_lookup(param, azure=False) for param in params_to_load_from_env}
+
+        # in an azure app service environment, we need to convert dots to underscores in the environment variables,
+        # and the parameters that had dots get their dots back in the config
+        # (but not ALL underscores, just the underscores that used to be a dot)
+        # example: param127.key1 is looked up as APPSETTING_PARAM127_KEY1, and loaded as config['param127.key1']
+        azure_params = dict.fromkeys(param.replace('.', '_') for param in params_to_load_from_env)
+        for param in env_vars_to_convert:
+            underscored = param.replace('.', '_')
+            if azure_params.get(underscored) is None and param != underscored:
+                azure_params[underscored] = param
+        self._azure_env_lookups = {
+            param or underscored: self._env_lookup(underscored, azure=True)
+            for underscored, param in azure_params.items()
+        }
+
+    def _env_lookup(self, param, azure, all_env=False):
+        # Note about Azure App Services:
+        # Azure converts dots to underscores in environment variables and adds a prefix (in addition to keeping the original name as well -- although still with underscores instead of dots)
+        # This applies to all settings in Azure App Services / Configuration / Application Settings -- but not system environment variables
+        env_var_to_lookup = f"{self.config_env_prefix}{param}"
+        env_var_to_lookup_in_azure = f"appsetting_{env_var_to_lookup}" # azure app services prefix
+        if azure:
+            # Azure converts the dots to underscores, so the nesting levels of sub-parameters can't be told apart
+            return (env_var_to_lookup, None if all_env else env_var_to_lookup_in_azure, f"{env_var_to_lookup_in_azure}_", None)
+        # all other places than Azure App Services (as far as we know)
+        return (env_var_to_lookup, None, f"{env_var_to_lookup}.", '.')
+
+    def load(self):
+        """
+        Load the config, or return the already loaded config if load() or reload() has been called before.
+
+        Returns:
+            dict: A dictionary containing the loaded configuration parameters.
+        """
+        if self.config is None:
+            return self.reload()
+        return self.config
+
+    def reload(self):
+        """
+        Load the config again from the environment and the config file.
+
+        With frozen=True, the parts of the config that didn't change are shared with the previously loaded config
+        (see freeze()), and if nothing changed, the previously loaded config is returned.
+
+        Returns:
+            dict: A dictionary containing the loaded configuration parameters (a FrozenConfig if frozen is True).
+        """
+        return self._load()
+
+    def _load(self, env=None):
+        # load the config, with an already indexed environment if given (load_configs() shares one between configs)
+        config_from_file = self._read_file()
+        if env is None:
+            env = self._index_env()
+        config = self._build(config_from_file, env)
+        if self.frozen:
+            config = freeze(config, self.config)
+        self.config = config
+        return self.config
+
+    def load_lazy(self):
+        """
+        Return a read-only Mapping that loads each parameter on first access (see LazyConfig).
+        The required parameters, and that the config file exists (unless ignore_missing_file), are checked immediately.
+
+        Returns:
+            LazyConfig: The config.
+        """
+        from .lazy import LazyConfig # imported here, as LazyConfig uses this module
+        if not self.ignore_missing_file:
+            # a missing config file should fail at startup, not on the first access that needs the file
+            for config_file in self.config_file if isinstance(self.config_file, list) else [self.config_file]:
+                if file_fingerprint(config_file) is None:
+                    raise FileNotFoundError(f"Config file not found: {config_file}")
+        config = LazyConfig(self, self._index_env())
+        self._check_required(config)
+        return config
+
+    def _index_env(self):
+        secrets = self._read_secrets()
+        if self.on_event is None:
+            return EnvIndex(secrets=secrets)
+        start = perf_counter()
+        env = EnvIndex(secrets=secrets)
+        self.on_event('env_index', {'seconds': perf_counter() - start, 'env_vars_scanned': len(env)})
+        return env
+
+    def _read_secrets(self):
+        # the secrets from the secret directories, as the (lower case) env.var names they are looked up by
+        if not self.secret_dirs:
+            return None
+        timing = self.on_event is not None
+        if timing:
+            start = perf_counter()
+        secrets = _secret_cache.load(self.secret_dirs)
+        if timing:
+            self.on_event('secrets', {'seconds': perf_counter() - start, 'dirs': len(self.secret_dirs), 'secrets': len(secrets)})
+        # secrets are looked up like env.vars named {config_env_prefix}{file name}, dotted names become nested dicts
+        # (in Azure as well, see _resolve_env), and env.vars with the same name override them (see EnvIndex)
+        prefix = self.config_env_prefix
+        return {f"{prefix}{name}".lower(): value for name, value in secrets.items()}
+
+    def _read_file(self, lazy=False):
+        if isinstance(self.config_file, list):
+            # layered config files: each file is parsed and cached separately, and merged with the previous ones
+            merged = _layer_cache.load(self.config_file, self._parse_file, self.parser, self.ignore_missing_file)
+            # the merged config is shared with the cache, so copy the parts we return
+            return {k: copy_tree(v) for k, v in merged.items() if self._params_to_load_from_file is None or k in self._params_to_load_from_file}
+
+        config_from_file = {}
+        try:
+            if self.mmap_file:
+                config_from_file = self._read_snapshot(self.config_file)
+                if config_from_file is None:
+                    # only parse the values of the keys we keep, see FileIndex
+                    return self._read_file_index(lazy)
+            else:
+                config_from_file = self._parse_file(self.config_file)
+        except FileNotFoundError:
+            if not self.ignore_missing_file:
+                raise FileNotFoundError(f"Config file not found: {self.config_file}")
+
+        # filter out the config parameters that are not in the list of parameters to load from the file
+        if self._params_to_load_from_file is not None:
+            config_from_file = {k: v for k, v in config_from_file.items() if k in self._params_to_load_from_file}
+        return config_from_file
+
+    def _parse_file(self, config_file):
+        # read and parse a config file (or its snapshot), and convert the top-level keys to lower case
+        config_from_file = self._read_snapshot(config_file)
+        if config_from_file is not None:
+            return config_from_file
+        timing = self.on_event is not None
+        try:
+            if timing:
+                start = perf_counter()
+            with open(config_file) as f:
+                text = f.read()
+            if timing:
+                self.on_event('read', {'seconds': perf_counter() - start, 'file': config_file, 'size': len(text)})
+                start = perf_counter()
+            config_from_file = parse_config_text(text, self.parser)
+            config_from_file = {k.lower(): v for k, v in config_from_file.items()} # Convert all keys to lower case
+            if timing:
+                self.on_event('parse', {'seconds': perf_counter() - start, 'file': config_file, 'keys': len(config_from_file)})
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON in config file: {config_file}: {e}")
+        return config_from_file
+
+    def _read_snapshot(self, config_file):
+        # the pre-parsed snapshot of the config file (see `python -m load_config snapshot`) with lower case top-level keys,
+        # or None if there is no up to date snapshot made with our parser
+        if not os.path.exists(snapshot_path(config_file)):
+            return None
+        timing = self.on_event is not None
+        if timing:
+            start = perf_counter()
+        snapshot = read_snapshot(config_file, self.parser)
+        if snapshot is None:
+            return None
+        config_from_file = {k.lower(): v for k, v in snapshot.items()} # Convert all keys to lower case
+        if timing:
+            self.on_event('snapshot', {'seconds': perf_counter() - start, 'file': config_file, 'keys': len(config_from_file)})
+        return config_from_file
+
+    def _read_file_index(self, lazy):
+        timing = self.on_event is not None
+        try:
+            if timing:
+                start = perf_counter()
+            index = FileIndex(self.config_file, self.parser, self._params_to_load_from_file)
+            if timing:
+                self.on_event('index', {'seconds': perf_counter() - start, 'file': self.config_file, 'keys': len(index)})
+                start = perf_counter()
+            if lazy:
+                return index # LazyConfig parses the values when they are accessed
+            try:
+                config_from_file = dict(index.items())
+            finally:
+                index.close()
+            if timing:
+                self.on_event('parse', {'seconds': perf_counter() - start, 'file': self.config_file, 'keys': len(config_from_file)})
+        except ValueError as e:
+            raise ValueError(f"Invalid JSON in config file: {self.config_file}: {e}")
+        return config_from_file
+
+    def _is_azure(self, env):
+        # detect if we're in an azure app service environment
+        return (
+            self.azure_app_services
+            or 'website_site_name' in env
+            or "website_resource_group" in env
+            or 'website_instance_id' in env
+            or env.has_prefix('appsetting_')
+        )
+
+    def _resolve_env(self, env, lookup, value=_MISSING):
+        env_var_to_lookup, env_var_to_lookup_in_azure, sub_param_prefix, separator = lookup
+
+        # if we're in an azure app service environment and the env.var with the prefix is set, then load it
+        if env_var_to_lookup_in_azure is not None and env_var_to_lookup_in_azure in env:
+            value = env.get(env_var_to_lookup_in_azure)
+
+        # if we're not in an azure app service environment, then just load the env.var without the prefix
+        # also if we're in an azure app service environment and the env.var with the prefix is not set, then try to get the env.var without the prefix, as this applies to system environment variables
+        if env_var_to_lookup in env:
+            if value is _MISSING or not value:
+                value = env.get(env_var_to_lookup)
+
+        # if there are env.vars that start with param and a dot, then load them as a dictionary
+        # e.g. PREFIX_PARAM1.KEY1=value1, PREFIX_PARAM1.KEY2=value2
+        # results in: config['param1'] = {'key1': 'value1', 'key2': 'value2'}
+        # deeper levels are nested as well: PREFIX_PARAM1.KEY1.SUB=value1 results in config['param1'] = {'key1': {'sub': 'value1'}}
+        sub_params = env.nested(sub_param_prefix, separator)
+        if separator is None and env.secrets:
+            # secret files are nested by their dots in Azure as well (Azure only converts the dots of its app settings),
+            # and the Azure env.vars override them
+            sub_params = {**env.nested(f"{env_var_to_lookup}.", '.', env.secrets), **sub_params}
+        if sub_params:
+            # Azure can expose both PARAM and PARAM_KEY values; nested keys win for object-like params.
+            if not isinstance(value, dict):
+                value = {}
+            value.update(sub_params)
+        return value
+
+    def _env_source(self, env, lookup):
+        # where the value of an env.var lookup came from, for provenance: 'azure' if from an APPSETTING_ env.var,
+        # 'secret' if only from secret files, otherwise 'env'
+        env_var_to_lookup, env_var_to_lookup_in_azure, sub_param_prefix, separator = lookup
+        if env.has_prefix(sub_param_prefix):
+            if separator is None:
+                return 'azure'
+            if env.secrets and all(k in env.secrets for k, _ in env.with_prefix(sub_param_prefix)):
+                return 'secret'
+            return 'env'
+        if env_var_to_lookup_in_azure is not None and env.get(env_var_to_lookup_in_azure) is not None:
+            if env.get(env_var_to_lookup_in_azure) or env_var_to_lookup not in env:
+                return 'azure'
+        if separator is None and env.secrets and env.nested(f"{env_var_to_lookup}.", '.', env.secrets):
+            return 'secret' # dotted secret files in Azure, see _resolve_env
+        return 'secret' if env_var_to_lookup in env.secrets else 'env'
+
+    def _load_env(self, env, azure, sources=None):
+        if self.load_from_env == 'all':
+            # filter out the env.vars that do not start with the config_env_prefix and remove the prefix from the ones that do
+            # (they are already in the correct format, so no Azure conversion of dots is needed)
+            config_from_env = env.nested(self.config_env_prefix)
+            lookups = {param: self._env_lookup(param, azure, all_env=True) for param in config_from_env}
+        else:
+            config_from_env = {}
+            lookups = self._azure_env_lookups if azure else self._env_lookups
+
+        for param, lookup in lookups.items():
+            value = self._resolve_env(env, lookup, config_from_env.get(param, _MISSING))
+            if value is not _MISSING:
+                config_from_env[param] = value
+                if sources is not None:
+                    sources[param] = self._env_source(env, lookup)
+        return config_from_env
+
+    def _build(self, config_from_file, env):
+        if self.on_event is not None:
+            return self._build_instrumented(config_from_file, env)
+
+        config_from_env = self._load_env(env, self._is_azure(env))
+        config = self._merge(config_from_file, config_from_env)
+        self._check_required(config)
+        return config
+
+    def _merge(self, config_from_file, config_from_env):
+        # Merge the config from the environment and the config file
+        if self.priority == 'env':
+            base, override = config_from_file, config_from_env
+        else:
+            base, override = config_from_env, config_from_file
+        if isinstance(self.config_file, list):
+            # the environment is merged into layered config files recursively, like the files themselves,
+            # so e.g. DB.HOST only overrides the host in the db settings merged from the files
+            return deep_merge(base, override)
+        return {**base, **override}
+
+    def _build_instrumented(self, config_from_file, env):
+        # same as _build, but reports the time of each phase, counts and the provenance of each key to on_event
+        start = perf_counter()
+        azure = self._is_azure(env)
+        env_sources = {}
+        config_from_env = self._load_env(env, azure, env_sources)
+        nested_keys = sum(_count_leaves(v) for v in config_from_env.values() if isinstance(v, dict))
+        self.on_event('env_lookup', {
+            'seconds': perf_counter() - start,
+            'azure_app_services': azure,
+            'keys': len(config_from_env),
+            'nested_keys': nested_keys,
+        })
+
+        start = perf_counter()
+        config = self._merge(config_from_file, config_from_env)
+        if self.priority == 'env':
+            provenance = {k: env_sources[k] if k in config_from_env else 'file' for k in config}
+        else:
+            provenance = {k: 'file' if k in config_from_file else env_sources[k] for k in config}
+        self.on_event('merge', {'seconds': perf_counter() - start, 'keys': len(config)})
+
+        self.on_event('loaded', {
+            'env_vars_scanned': len(env),
+            'keys_loaded': len(config),
+            'nested_keys': nested_keys,
+            'provenance': provenance,
+        })
+        self._check_required(config)
+        return config
+
+    def _check_required(self, config):
+        # Check that all required config parameters are present
+        for param in self.required_config_params:
+            if param not in config:
+                config_file = ', '.join(self.config_file) if isinstance(self.config_file, list) else self.config_file
+                message = f"Missing required config parameter: {param}. It can be set either as an environment variable (as {param.upper()}) or in {config_file} (as {param})."
+                if self.raise_on_missing:
+                    raise MissingConfigParameterError(message, param)
+                print(message)
+                exit(1)
+
+
+def _count_leaves(value):
+    if isinstance(value, dict):
+        return sum(_count_leaves(v) for v in value.values())
+    return 1
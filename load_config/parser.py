@@ -0,0 +1,61 @@
+import json
+import json5
+
+try:
+    import orjson
+except ImportError: # orjson is optional, the standard library json module is used if it's not installed
+    orjson = None
+
+PARSERS = ('auto', 'json', 'json5')
+
+# orjson parses integers that don't fit in 64 bits as floats instead of raising an error, losing precision,
+# so documents with numbers of 19 or more digits (which may be out of range) are parsed with the json module.
+# Mapping every digit to '0' turns finding such a number into a (fast) substring search.
+_DIGITS_TO_ZERO = bytes(48 if 48 <= i <= 57 else 32 for i in range(256))
+_LARGE_NUMBER = b'0' * 19
+
+
+def has_large_numbers(text):
+    """
+    Return whether a JSON document (str or bytes-like) may contain integers that orjson can't parse exactly.
+    """
+    data = text.encode('utf-8') if isinstance(text, str) else bytes(text)
+    return _LARGE_NUMBER in data.translate(_DIGITS_TO_ZERO)
+
+
+def _loads_strict(text):
+    if orjson is not None and not has_large_numbers(text):
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def parse_config_text(text, parser='auto'):
+    """
+    Parse the contents of a config file.
+
+    json5 is a pure Python parser and is slow on large files, while most config files are plain JSON.
+    With parser='auto', the text is first parsed with a strict JSON parser (orjson if installed, otherwise the json module,
+    which is also used for texts with integers too large for orjson to parse exactly),
+    and only parsed with json5 if that fails, i.e. if the file uses JSON5 syntax such as comments or trailing commas
+    (or is invalid, in which case the error comes from json5 as before).
+
+    Args:
+        text (str): The contents of the config file.
+        parser (str, optional): 'auto', 'json' (strict JSON only) or 'json5' (always use json5). Defaults to 'auto'.
+
+    Returns:
+        The parsed document.
+
+    Raises:
+        ValueError: If the text can't be parsed.
+    """
+    if parser == 'json5':
+        return json5.loads(text)
+    if parser == 'json':
+        return _loads_strict(text)
+    if parser == 'auto':
+        try:
+            return _loads_strict(text)
+        except ValueError:
+            return json5.loads(text)
+    raise ValueError("parser must be 'auto', 'json' or 'json5'")
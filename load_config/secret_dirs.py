@@ -0,0 +1,131 @@
+import os
+import threading
+from collections import OrderedDict
+from .executors import shared_executor
+
+# below this many files, reading them one after another is faster than handing them to threads
+_CONCURRENT_READ_THRESHOLD = 16
+
+
+def secret_dir_fingerprint(secret_dir):
+    """
+    Return a cheap fingerprint of a secret directory, used to detect if its files may have changed.
+
+    Adding, removing or renaming files changes the directory's mtime. Kubernetes updates mounted secrets by
+    writing them to a new hidden directory and atomically swapping the `..data` symlink to it, so the symlink's
+    target is part of the fingerprint as well. Files modified in place (without replacing them) are not detected.
+
+    Args:
+        secret_dir (str): Path to the directory.
+
+    Returns:
+        tuple: (real path, mtime_ns, inode, `..data` symlink target), or None if the directory does not exist.
+    """
+    try:
+        st = os.stat(secret_dir)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    try:
+        data_target = os.readlink(os.path.join(secret_dir, '..data'))
+    except OSError: # not a Kubernetes secret volume
+        data_target = None
+    return (os.path.realpath(secret_dir), st.st_mtime_ns, st.st_ino, data_target)
+
+
+def secret_dirs_fingerprint(secret_dirs):
+    """
+    Return a tuple of the fingerprints of a list of secret directories (or of a single one).
+    """
+    if secret_dirs is None:
+        return None
+    if isinstance(secret_dirs, (str, os.PathLike)):
+        secret_dirs = [secret_dirs]
+    return tuple(secret_dir_fingerprint(secret_dir) for secret_dir in secret_dirs)
+
+
+def _read_secret(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            # files written with echo or an editor end with a newline, which is not part of the secret
+            return f.read().rstrip('\r\n')
+    except UnicodeDecodeError as e:
+        raise ValueError(f"Invalid secret file: {path}: {e}")
+
+
+def read_secret_dir(secret_dir, executor=None):
+    """
+    Read a key-per-file secret directory (e.g. a Kubernetes secret volume or Docker's /run/secrets).
+
+    Every regular file (or symlink to one) is a secret, named by its file name. Hidden entries, such as the `..data`
+    symlink and the timestamped directories of Kubernetes secret volumes, are skipped. Large directories are read
+    concurrently.
+
+    Args:
+        secret_dir (str): Path to the directory.
+        executor (concurrent.futures.Executor, optional): The executor to read large directories with.
+            Defaults to a shared thread pool of at most 8 threads.
+
+    Returns:
+        dict: {file name: contents without the trailing newline}, or an empty dict if the directory does not exist.
+    """
+    try:
+        with os.scandir(secret_dir) as entries:
+            paths = {entry.name: entry.path for entry in entries if not entry.name.startswith('.') and entry.is_file()}
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+
+    if len(paths) < _CONCURRENT_READ_THRESHOLD:
+        return {name: _read_secret(path) for name, path in paths.items()}
+    values = (executor or shared_executor('load_config_secrets')).map(_read_secret, paths.values())
+    return dict(zip(paths, values))
+
+
+class SecretDirCache:
+    """
+    Caches the contents of secret directories by their fingerprint (see secret_dir_fingerprint),
+    so unchanged directories are not read again.
+
+    Args:
+        maxsize (int, optional): Maximum number of cached directories. Defaults to 32.
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def read(self, secret_dir):
+        """
+        Return the secrets in secret_dir (see read_secret_dir), reading them only if the directory is not cached
+        or has changed. The returned dict is shared with the cache, so it must not be modified.
+        """
+        fingerprint = secret_dir_fingerprint(secret_dir)
+        if fingerprint is None:
+            return {}
+        with self._lock:
+            secrets = self._entries.get(fingerprint)
+            if secrets is not None:
+                self._entries.move_to_end(fingerprint)
+                return secrets
+        secrets = read_secret_dir(secret_dir)
+        with self._lock:
+            self._entries[fingerprint] = secrets
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return secrets
+
+    def load(self, secret_dirs):
+        """
+        Read a list of secret directories, later directories overriding earlier ones.
+
+        Returns:
+            dict: {file name: secret}.
+        """
+        secrets = {}
+        for secret_dir in secret_dirs:
+            secrets.update(self.read(secret_dir))
+        return secrets
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
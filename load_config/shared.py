@@ -0,0 +1,155 @@
+import sys
+import struct
+import threading
+from multiprocessing import shared_memory, resource_tracker
+from .snapshot import encode_config, decode_config
+from .frozen import freeze
+
+# control segment: magic and generation counter; data segment (one per generation): payload length and payload
+_CONTROL = struct.Struct('<8sQ')
+_MAGIC = b'LCSHM1\0\0'
+_LENGTH = struct.Struct('<Q')
+
+
+_attach_lock = threading.Lock()
+
+
+def _attach(name):
+    # attach to an existing shared memory segment without registering it with the resource tracker, which would
+    # unlink it when this process exits (or, for forked workers sharing the master's tracker, forget the master's registration)
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    with _attach_lock:
+        register = resource_tracker.register
+        def register_others(resource_name, rtype):
+            if rtype != 'shared_memory' or resource_name.lstrip('/') != name:
+                register(resource_name, rtype)
+        resource_tracker.register = register_others
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _data_segment_name(name, generation):
+    return f"{name}.{generation}"
+
+
+class ConfigPublisher:
+    """
+    Publishes a loaded config in shared memory, so worker processes can use it without loading it themselves.
+
+    Meant for pre-fork servers (gunicorn, uvicorn etc.): the master process loads the config once and publishes it,
+    and the workers read it with SharedConfig. The config is serialized once into a read-only shared memory segment;
+    publishing again (e.g. after reloading the config) creates a new segment and increments a generation counter,
+    which is how workers notice that there is a new config.
+
+    Args:
+        name (str): Name of the shared memory (must be unique on the host, e.g. include the application name).
+
+    Example:
+        # in the master process
+        publisher = ConfigPublisher('myapp-config')
+        publisher.publish(load_config(required_config_params=["param"]))
+
+        # in the workers
+        shared = SharedConfig('myapp-config')
+        shared.config["param"]
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.generation = 0
+        self._control = shared_memory.SharedMemory(name=name, create=True, size=_CONTROL.size)
+        _CONTROL.pack_into(self._control.buf, 0, _MAGIC, 0)
+        self._data = None
+
+    def publish(self, config):
+        """
+        Publish a (new version of the) config.
+
+        Returns:
+            int: The generation of the published config.
+        """
+        payload = encode_config(config)
+        generation = self.generation + 1
+        data = shared_memory.SharedMemory(name=_data_segment_name(self.name, generation), create=True, size=_LENGTH.size + len(payload))
+        _LENGTH.pack_into(data.buf, 0, len(payload))
+        data.buf[_LENGTH.size:_LENGTH.size + len(payload)] = payload
+        # only make the new segment visible once it's complete
+        _CONTROL.pack_into(self._control.buf, 0, _MAGIC, generation)
+        self.generation = generation
+
+        # workers that already attached to the previous segment keep their mapping after it's unlinked
+        if self._data is not None:
+            self._data.close()
+            self._data.unlink()
+        self._data = data
+        return generation
+
+    def close(self):
+        """
+        Remove the shared memory. Workers that already have the config keep it.
+        """
+        for segment in (self._data, self._control):
+            if segment is not None:
+                segment.close()
+                segment.unlink()
+        self._data = self._control = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class SharedConfig:
+    """
+    A config published in shared memory by ConfigPublisher, for use in worker processes.
+
+    Checking for a new version is a read of a counter in shared memory, so `config` can be read often (e.g. per request).
+    The config is only deserialized when a new version has been published. It is a FrozenConfig, as the same config is
+    returned to every reader in the process, and its unchanged parts are shared with the previous version (see freeze()).
+
+    Args:
+        name (str): Name of the shared memory, as given to ConfigPublisher.
+
+    Raises:
+        FileNotFoundError: If no config has been published with this name.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.generation = None
+        self._config = None
+        self._control = _attach(name)
+
+    def _read_generation(self):
+        magic, generation = _CONTROL.unpack_from(self._control.buf, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"Shared memory {self.name} does not contain a published config")
+        return generation
+
+    @property
+    def config(self):
+        """
+        The latest published config, as a FrozenConfig (None if no config has been published yet).
+        """
+        generation = self._read_generation()
+        while generation != self.generation and generation != 0:
+            try:
+                data = _attach(_data_segment_name(self.name, generation))
+            except FileNotFoundError: # a newer config was published in the meantime, and this one was removed
+                generation = self._read_generation()
+                continue
+            try:
+                (length,) = _LENGTH.unpack_from(data.buf, 0)
+                self._config = freeze(decode_config(data.buf[_LENGTH.size:_LENGTH.size + length]), self._config)
+            finally:
+                data.close()
+            self.generation = generation
+        return self._config
+
+    def close(self):
+        self._control.close()
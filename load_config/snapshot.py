@@ -0,0 +1,107 @@
+import os
+import json
+import hashlib
+from collections.abc import Mapping
+from .parser import PARSERS, parse_config_text, has_large_numbers, orjson
+
+# snapshot file layout: MAGIC, the parser it was made with (one byte, its index in PARSERS),
+# the sha256 digest of the config file it was made from, and the parsed config as compact strict JSON
+MAGIC = b'LCSNAP2\n'
+SNAPSHOT_SUFFIX = '.snapshot'
+
+
+def encode_config(config):
+    """
+    Serialize a parsed config as compact strict JSON (UTF-8).
+    """
+    return json.dumps(config, separators=(',', ':'), ensure_ascii=False, default=_to_json).encode('utf-8')
+
+
+def _to_json(value):
+    # serialize other Mappings (e.g. FrozenConfig) as objects
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def decode_config(payload):
+    """
+    Deserialize a config serialized by encode_config (bytes or memoryview), with the fastest available parser.
+    """
+    if orjson is not None and not has_large_numbers(payload):
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError: # e.g. NaN, which orjson doesn't support
+            pass
+    return json.loads(bytes(payload))
+
+
+def snapshot_path(config_file):
+    """
+    Return the path of the snapshot of a config file (stored next to it, e.g. config.json.snapshot).
+    """
+    return f"{config_file}{SNAPSHOT_SUFFIX}"
+
+
+def write_snapshot(config_file, parser='auto'):
+    """
+    Parse (and thereby validate) a config file and store the result as a snapshot next to it.
+
+    The snapshot contains a hash of the config file and the parser, so it is only used as long as the config file is
+    unchanged, and only when loading with the same parser (so e.g. a JSON5 file snapshotted with 'auto' is still
+    rejected by parser='json').
+    It stores the parsed config as compact strict JSON (no pickle/marshal, so loading a snapshot can't execute code),
+    which is parsed by the fast C parsers instead of json5.
+
+    Args:
+        config_file (str): Path to the config file.
+        parser (str, optional): The parser to use, see load_config(). Defaults to 'auto'.
+
+    Returns:
+        str: The path of the snapshot.
+
+    Raises:
+        ValueError: If the config file is not valid JSON/JSON5 or doesn't contain an object.
+    """
+    with open(config_file, 'rb') as f:
+        source = f.read()
+    try:
+        config = parse_config_text(source.decode('utf-8'), parser)
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON in config file: {config_file}: {e}")
+    if not isinstance(config, dict):
+        raise ValueError(f"Invalid config file: {config_file}: the top level must be an object")
+
+    payload = encode_config(config)
+    path = snapshot_path(config_file)
+    tmp_path = f"{path}.tmp{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC + bytes([PARSERS.index(parser)]) + hashlib.sha256(source).digest() + payload)
+    os.replace(tmp_path, path) # atomic, so readers never see a partially written snapshot
+    return path
+
+
+def read_snapshot(config_file, parser='auto'):
+    """
+    Return the parsed config from the snapshot of a config file, or None if there is no snapshot,
+    it doesn't match the current contents of the config file, it was made with a different parser or it is damaged.
+    """
+    try:
+        with open(snapshot_path(config_file), 'rb') as f:
+            data = f.read()
+        with open(config_file, 'rb') as f:
+            source = f.read()
+    except FileNotFoundError:
+        return None
+
+    digest_start = len(MAGIC) + 1
+    digest_end = digest_start + hashlib.sha256().digest_size
+    if len(data) < digest_end or not data.startswith(MAGIC) or data[len(MAGIC)] != PARSERS.index(parser):
+        return None
+    if data[digest_start:digest_end] != hashlib.sha256(source).digest():
+        return None
+    try:
+        config = decode_config(data[digest_end:])
+    except ValueError: # a damaged snapshot, parse the config file instead
+        return None
+    return config if isinstance(config, dict) else None
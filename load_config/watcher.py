@@ -0,0 +1,209 @@
+import os
+import select
+import logging
+import threading
+import ctypes
+import ctypes.util
+from .cache import config_file_fingerprint
+from .secret_dirs import secret_dirs_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def diff_configs(old, new):
+    """
+    Return the set of top-level keys that were added, removed or changed between two configs.
+    """
+    changed = old.keys() ^ new.keys()
+    # identical values (e.g. the unchanged parts of a FrozenConfig) are skipped without comparing them
+    changed.update(k for k in old.keys() & new.keys() if old[k] is not new[k] and old[k] != new[k])
+    return changed
+
+
+class _Inotify:
+    # minimal inotify binding (Linux only), used to wake up as soon as a config file's directory changes
+    IN_MODIFY = 0x002
+    IN_ATTRIB = 0x004
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    def __init__(self, directories):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        mask = (self.IN_MODIFY | self.IN_ATTRIB | self.IN_CLOSE_WRITE | self.IN_MOVED_FROM
+                | self.IN_MOVED_TO | self.IN_CREATE | self.IN_DELETE)
+        for directory in directories:
+            if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+                errno = ctypes.get_errno()
+                os.close(self.fd)
+                raise OSError(errno, f'inotify_add_watch failed for {directory}')
+
+    def wait(self, timeout):
+        # wait for events (or the timeout), and drain them; which file changed is checked by the caller
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if readable:
+            try:
+                while os.read(self.fd, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+        return bool(readable)
+
+    def close(self):
+        os.close(self.fd)
+
+
+class ConfigWatcher:
+    """
+    Reload a config in a background thread when its config file changes, and notify callbacks about the changed keys.
+
+    The config file (or all layered config files) is watched with inotify where available (Linux),
+    otherwise its (mtime_ns, size, inode) is polled.
+    The file is only re-parsed when it has actually changed and has been unchanged for `debounce` seconds
+    (so a file being written is not parsed half way), and the config is reloaded by the ConfigLoader,
+    so the environment/file priority rules are the same as for load_config().
+    The loader's secret directories (see secret_dirs in load_config()) are watched as well.
+    If reloading fails (e.g. invalid JSON or a missing required parameter), the previous config is kept.
+
+    Reading `watcher.config` never blocks; callbacks are called from the watcher thread.
+
+    Args:
+        loader (ConfigLoader): The loader to reload the config with.
+        interval (float, optional): Seconds between checks of the config file. Defaults to 1.0.
+        debounce (float, optional): Seconds the file must be unchanged before it is reloaded. Defaults to 0.1.
+        use_inotify (bool, optional): Whether to use inotify if available. Defaults to True.
+
+    Example:
+        watcher = ConfigWatcher(ConfigLoader(required_config_params=["param"]))
+        watcher.add_callback(lambda changed, config: print(f"changed: {changed}"))
+        watcher.start()
+        ...
+        watcher.config["param"]
+    """
+
+    def __init__(self, loader, interval=1.0, debounce=0.1, use_inotify=True):
+        self.loader = loader
+        self.interval = interval
+        self.debounce = debounce
+        self.use_inotify = use_inotify
+        self.config = None
+        self._callbacks = []
+        self._fingerprint = None
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock() # serializes check(), which the watcher thread and callers can run at the same time
+
+    def add_callback(self, callback):
+        """
+        Register callback(changed_keys, config), called with the set of changed top-level keys and the new config.
+        """
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback):
+        self._callbacks.remove(callback)
+
+    def start(self):
+        """
+        Load the config (in the calling thread, so errors surface immediately) and start watching the config file.
+        """
+        self._fingerprint = self._source_fingerprint()
+        self.config = self.loader.reload()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='ConfigWatcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop watching the config file.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _source_fingerprint(self):
+        # the config file(s) and the secret directories the config is loaded from
+        return (config_file_fingerprint(self.loader.config_file), secret_dirs_fingerprint(self.loader.secret_dirs))
+
+    def _open_inotify(self):
+        if not self.use_inotify:
+            return None
+        try:
+            config_files = self.loader.config_file if isinstance(self.loader.config_file, list) else [self.loader.config_file]
+            directories = {os.path.dirname(os.path.abspath(config_file)) for config_file in config_files}
+            directories.update(os.path.abspath(secret_dir) for secret_dir in self.loader.secret_dirs if os.path.isdir(secret_dir))
+            return _Inotify(directories)
+        except (OSError, AttributeError, TypeError): # not Linux, or the directory doesn't exist
+            return None
+
+    def _run(self):
+        inotify = self._open_inotify()
+        try:
+            while not self._stop.is_set():
+                if inotify is not None:
+                    inotify.wait(self.interval)
+                else:
+                    self._stop.wait(self.interval)
+                if not self._stop.is_set():
+                    self.check()
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def check(self):
+        """
+        Reload the config if the config file has changed, and call the callbacks if any keys changed.
+        Called periodically by the watcher thread, but can also be called directly (calls are serialized, so a change
+        is only reloaded and reported once). If the watcher is stopped while waiting for the file to stop changing,
+        the config is not reloaded.
+
+        Returns:
+            set: The changed top-level keys (empty if nothing changed).
+        """
+        with self._lock:
+            # stop() can only interrupt the debounce if the watcher was running when we started
+            running = not self._stop.is_set()
+            fingerprint = self._source_fingerprint()
+            if fingerprint == self._fingerprint:
+                return set()
+            # wait for the file to stop changing before parsing it
+            while True:
+                if self._stop.wait(self.debounce):
+                    if running:
+                        return set() # stopped while waiting, don't reload
+                    break
+                latest = self._source_fingerprint()
+                if latest == fingerprint:
+                    break
+                fingerprint = latest
+            self._fingerprint = fingerprint
+
+            try:
+                config = self.loader.reload()
+            except (Exception, SystemExit) as e: # load_config exits if a required parameter is missing
+                logger.warning(f"Failed to reload config from {self.loader.config_file}, keeping the previous config: {e!r}")
+                return set()
+
+            changed = diff_configs(self.config, config)
+            self.config = config
+            if changed:
+                for callback in list(self._callbacks):
+                    try:
+                        callback(changed, config)
+                    except Exception:
+                        logger.exception("Config change callback failed")
+            return changed
@@ -14,5 +14,8 @@ setup(
     install_requires=[
         'json5',
     ],
+    extras_require={
+        'fast': ['orjson'],
+    },
     url='https://github.com/MorrowBatteries/load_config'
 )
\ No newline at end of file
@@ -0,0 +1,29 @@
+import pytest
+import os
+from load_config import load_config
+from load_config.loader import _layer_cache, _secret_cache
+
+@pytest.fixture(autouse=True)
+def isolate_environment_variables():
+    original_environ = os.environ.copy()
+    yield
+    os.environ.clear()
+    os.environ.update(original_environ)
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    # the caches are module level, so a test could otherwise get configs cached by another one
+    load_config.cache_clear()
+    _layer_cache.clear()
+    _secret_cache.clear()
+
+@pytest.fixture
+def config_text():
+    # override in a test module for a different config file
+    return '{"param1": "file_value1", "param2": "file_value2"}'
+
+@pytest.fixture
+def config_file(tmp_path, config_text):
+    path = tmp_path / 'config.json'
+    path.write_text(config_text)
+    return str(path)
@@ -0,0 +1,55 @@
+import pytest
+import os
+import asyncio
+import threading
+from load_config import load_config, load_config_async
+from load_config.loader import ConfigLoader
+
+@pytest.fixture
+def config_files(tmp_path):
+    paths = []
+    for i in range(3):
+        path = tmp_path / f'config{i}.json'
+        path.write_text(f'{{"param{i}": "file_value{i}", "shared": {{"key{i}": {i}}}}}')
+        paths.append(str(path))
+    return paths
+
+def test_load_config_async_matches_load_config(config_files):
+    os.environ['PARAM0'] = 'env_value0'
+    kwargs = dict(required_config_params=['param0'], config_file=config_files)
+    config = asyncio.run(load_config_async(**kwargs))
+    assert config == load_config(**kwargs)
+    assert config['shared'] == {'key0': 0, 'key1': 1, 'key2': 2}
+
+def test_load_config_async_parses_layers_concurrently(config_files, monkeypatch):
+    barrier = threading.Barrier(3, timeout=5)
+    parse_file = ConfigLoader._parse_file
+    def slow_parse_file(self, config_file):
+        barrier.wait() # only passes if all three layers are parsed at the same time
+        return parse_file(self, config_file)
+    monkeypatch.setattr(ConfigLoader, '_parse_file', slow_parse_file)
+    config = asyncio.run(load_config_async(config_file=config_files))
+    assert config['param2'] == 'file_value2'
+
+def test_load_config_async_timeout(config_files, monkeypatch):
+    parse_file = ConfigLoader._parse_file
+    release = threading.Event()
+    finished = threading.Semaphore(0)
+    def slow_parse_file(self, config_file):
+        release.wait(5)
+        try:
+            return parse_file(self, config_file)
+        finally:
+            finished.release()
+    monkeypatch.setattr(ConfigLoader, '_parse_file', slow_parse_file)
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(load_config_async(config_file=config_files, timeout=0.05)) # pragma: no cover
+    # the abandoned threads keep parsing, so wait for them, or they would read files during the next tests
+    release.set()
+    for _ in config_files:
+        assert finished.acquire(timeout=5)
+
+def test_load_config_async_missing_required_param(config_files):
+    with pytest.raises(SystemExit) as e:
+        asyncio.run(load_config_async(required_config_params=['param3'], config_file=config_files)) # pragma: no cover
+    assert str(e.value) == "1"
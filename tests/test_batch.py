@@ -0,0 +1,79 @@
+import pytest
+import os
+import threading
+from unittest.mock import patch
+from load_config import load_configs, LoadResult, MissingConfigParameterError, FrozenConfig
+from load_config.env_index import EnvIndex
+
+@pytest.fixture
+def specs(tmp_path):
+    specs = []
+    for tenant in ('a', 'b', 'c'):
+        path = tmp_path / f'{tenant}.json'
+        path.write_text(f'{{"param1": "{tenant}_file_value1", "param2": "{tenant}_file_value2"}}')
+        specs.append({'required_config_params': ['param1'], 'config_file': str(path), 'config_env_prefix': f'TENANT_{tenant.upper()}_'})
+    return specs
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_load_configs(specs, workers):
+    os.environ['TENANT_B_PARAM1'] = 'b_env_value1'
+    results = load_configs(specs, workers=workers)
+    assert results == [
+        LoadResult({'param1': 'a_file_value1', 'param2': 'a_file_value2'}, None),
+        LoadResult({'param1': 'b_env_value1', 'param2': 'b_file_value2'}, None),
+        LoadResult({'param1': 'c_file_value1', 'param2': 'c_file_value2'}, None),
+    ]
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_load_configs_reports_errors_per_config(specs, tmp_path, workers):
+    specs[0]['required_config_params'] = ['param1', 'param3']
+    specs[1]['config_file'] = str(tmp_path / 'missing.json')
+    (tmp_path / 'invalid.json').write_text('{"param1": ')
+    specs.append({'config_file': str(tmp_path / 'invalid.json')})
+    specs.append({'priority': 'invalid'})
+    results = load_configs(specs, workers=workers)
+
+    assert results[0].config is None
+    assert isinstance(results[0].error, MissingConfigParameterError)
+    assert results[0].error.param == 'param3'
+    assert str(results[0].error).startswith('Missing required config parameter: param3.')
+    assert isinstance(results[1].error, FileNotFoundError)
+    assert results[2] == LoadResult({'param1': 'c_file_value1', 'param2': 'c_file_value2'}, None)
+    assert isinstance(results[3].error, ValueError)
+    assert str(results[3].error).startswith('Invalid JSON in config file:')
+    assert str(results[4].error) == "priority must be 'env' or 'file'"
+
+def test_load_configs_indexes_environment_once(specs):
+    with patch('load_config.batch.EnvIndex', wraps=EnvIndex) as m:
+        load_configs(specs * 10, workers=1)
+        m.assert_called_once()
+
+def test_load_configs_with_secret_dirs(specs, tmp_path):
+    (tmp_path / 'secrets').mkdir()
+    (tmp_path / 'secrets' / 'param1').write_text('secret_value1')
+    specs[0]['config_env_prefix'] = ''
+    specs[0]['secret_dirs'] = str(tmp_path / 'secrets')
+    results = load_configs(specs, workers=1)
+    assert results[0].config['param1'] == 'secret_value1'
+    assert results[1].config['param1'] == 'b_file_value1'
+
+def test_load_configs_empty():
+    assert load_configs([]) == []
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_load_configs_frozen(specs, workers):
+    specs[0]['frozen'] = True
+    results = load_configs(specs, workers=workers)
+    assert isinstance(results[0].config, FrozenConfig)
+    assert results[0].config == {'param1': 'a_file_value1', 'param2': 'a_file_value2'}
+    assert type(results[1].config) is dict
+
+def test_load_configs_from_concurrent_threads(specs):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(load_configs(specs * 20, workers=1))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 4
+    assert all(error is None for result in results for _, error in result)
@@ -0,0 +1,85 @@
+import pytest
+import os
+from unittest.mock import patch
+from load_config import load_config
+from load_config.cache import ConfigCache, environ_fingerprint, environ_prefixes, make_key
+
+@pytest.fixture
+def config_text():
+    return '{"param1": "file_value1", "nested": {"key1": "file_value1"}}'
+
+def test_cache_hit_does_not_reparse(config_file):
+    config = load_config(config_file=config_file, cache=True)
+    with patch('load_config.loader.parse_config_text') as m:
+        assert load_config(config_file=config_file, cache=True) == config
+        m.assert_not_called()
+    assert load_config.cache_info().hits == 1
+    assert load_config.cache_info().misses == 1
+
+def test_cache_returns_copies(config_file):
+    config = load_config(config_file=config_file, cache=True)
+    config['nested']['key1'] = 'modified'
+    config = load_config(config_file=config_file, cache=True)
+    assert config['nested']['key1'] == 'file_value1'
+    config['nested']['key1'] = 'modified'
+    assert load_config(config_file=config_file, cache=True)['nested']['key1'] == 'file_value1'
+
+def test_cache_invalidated_by_file_change(config_file):
+    load_config(config_file=config_file, cache=True)
+    with open(config_file, 'w') as f:
+        f.write('{"param1": "file_value1_changed"}')
+    assert load_config(config_file=config_file, cache=True)['param1'] == 'file_value1_changed'
+
+def test_cache_invalidated_by_env_change(config_file):
+    load_config(config_file=config_file, load_from_env='all', cache=True)
+    os.environ['PARAM1'] = 'env_value1'
+    assert load_config(config_file=config_file, load_from_env='all', cache=True)['param1'] == 'env_value1'
+
+def test_cache_keyed_by_arguments(config_file):
+    os.environ['PARAM1'] = 'env_value1'
+    assert load_config(config_file=config_file, load_from_env='all', priority='env', cache=True)['param1'] == 'env_value1'
+    assert load_config(config_file=config_file, load_from_env='all', priority='file', cache=True)['param1'] == 'file_value1'
+
+def test_cache_clear(config_file):
+    load_config(config_file=config_file, cache=True)
+    load_config.cache_clear()
+    assert load_config.cache_info() == (0, 0, 32, 0)
+
+def test_cache_lru_eviction():
+    cache = ConfigCache(maxsize=2)
+    cache.put('a', {'v': 1})
+    cache.put('b', {'v': 2})
+    cache.get('a')
+    cache.put('c', {'v': 3})
+    assert cache.get('b') is None
+    assert cache.get('a') == {'v': 1}
+    assert cache.info().currsize == 2
+
+def test_environ_fingerprint_only_covers_relevant_variables():
+    prefixes = environ_prefixes(['param1', 'param2.key1'], 'required', '')
+    fingerprint = environ_fingerprint(prefixes)
+    os.environ['UNRELATED'] = 'value'
+    assert environ_fingerprint(prefixes) == fingerprint
+    for name in ('PARAM1', 'PARAM2.KEY2', 'APPSETTING_PARAM2_KEY1', 'WEBSITE_SITE_NAME'):
+        os.environ[name] = 'value'
+        assert environ_fingerprint(prefixes) != fingerprint
+        fingerprint = environ_fingerprint(prefixes)
+    assert environ_prefixes([], 'all', '') is None
+    assert 'prefix_' in environ_prefixes([], 'all', 'PREFIX_')
+
+def test_cache_not_invalidated_by_unrelated_env_change(config_file):
+    load_config(required_config_params=['param1'], config_file=config_file, cache=True)
+    os.environ['UNRELATED'] = 'value'
+    load_config(required_config_params=['param1'], config_file=config_file, cache=True)
+    assert load_config.cache_info().hits == 1
+    os.environ['PARAM1'] = 'env_value1'
+    assert load_config(required_config_params=['param1'], config_file=config_file, cache=True)['param1'] == 'env_value1'
+
+def test_make_key_with_iterable_arguments():
+    assert make_key(['a', 'b'], {'a'}, ('c',), 'str', None) == (('a', 'b'), frozenset({'a'}), ('c',), 'str', None)
+    hash(make_key(['a'], {'a'}))
+
+def test_cache_with_set_of_required_params(config_file):
+    assert load_config(required_config_params={'param1'}, config_file=config_file, cache=True)['param1'] == 'file_value1'
+    assert load_config(required_config_params={'param1'}, config_file=config_file, cache=True)['param1'] == 'file_value1'
+    assert load_config.cache_info().hits == 1
@@ -0,0 +1,24 @@
+from load_config.env_index import EnvIndex
+
+def test_env_index_lowercases_names():
+    env = EnvIndex({'PARAM1': 'Value1', 'Param2': 'value2'})
+    assert 'param1' in env
+    assert env.get('param2') == 'value2'
+    assert env.get('PARAM1') is None
+    assert len(env) == 2
+
+def test_env_index_prefix_lookup():
+    env = EnvIndex({'A_X': '1', 'A_Y': '2', 'AB': '3', 'B_X': '4'})
+    assert list(env.with_prefix('a_')) == [('a_x', '1'), ('a_y', '2')]
+    assert env.has_prefix('b_')
+    assert not env.has_prefix('c')
+    assert list(env.with_prefix('c')) == []
+
+def test_env_index_nested():
+    env = EnvIndex({'P.A.B': '1', 'P.A.C': '2', 'P.D': '3', 'Q.A': '4'})
+    assert env.nested('p.') == {'a.b': '1', 'a.c': '2', 'd': '3'}
+    assert env.nested('p.', separator='.') == {'a': {'b': '1', 'c': '2'}, 'd': '3'}
+
+def test_env_index_nested_keys_win_over_values():
+    env = EnvIndex({'P.A': 'scalar', 'P.A.B': '1'})
+    assert env.nested('p.', separator='.') == {'a': {'b': '1'}}
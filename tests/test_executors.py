@@ -0,0 +1,16 @@
+import threading
+from load_config.executors import shared_executor
+
+def test_shared_executor_created_once():
+    executors = []
+    barrier = threading.Barrier(8)
+    def get():
+        barrier.wait()
+        executors.append(shared_executor('load_config_test'))
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert all(e is executors[0] for e in executors)
+    assert shared_executor('load_config_test_other') is not executors[0]
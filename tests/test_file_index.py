@@ -0,0 +1,93 @@
+import pytest
+from unittest.mock import patch
+from load_config import load_config
+from load_config.file_index import FileIndex, index_top_level
+from load_config.parser import parse_config_text
+from load_config.__main__ import main
+
+JSON5_DOC = b'''{
+    // comment with "quotes" and {braces}
+    "Param1": "value with } and \\" inside",
+    param2: {'key1': [1, 2, {"x": "]"}], /* } */ key2: 0x1F,},
+    'param3': -Infinity,
+    "param4": null,
+    "param1": "duplicate wins",
+}'''
+
+@pytest.fixture
+def config_text():
+    return JSON5_DOC.decode('utf-8')
+
+def test_index_top_level():
+    offsets = index_top_level(JSON5_DOC)
+    assert list(offsets) == ['param1', 'param2', 'param3', 'param4']
+    assert {k: JSON5_DOC[start:end] for k, (start, end) in offsets.items()} == {
+        'param1': b'"duplicate wins"',
+        'param2': b'''{'key1': [1, 2, {"x": "]"}], /* } */ key2: 0x1F,}''',
+        'param3': b'-Infinity',
+        'param4': b'null',
+    }
+
+def test_index_top_level_rejects_trailing_content():
+    with pytest.raises(ValueError):
+        index_top_level(b'{"a": 1} x')
+
+def test_file_index_only_parses_accessed_values(config_file):
+    index = FileIndex(config_file, keys={'param2', 'param4'})
+    assert list(index) == ['param2', 'param4']
+    with patch('load_config.file_index.parse_config_text', return_value='parsed') as m:
+        assert index['param4'] == 'parsed'
+        assert index['param4'] == 'parsed'
+        m.assert_called_once_with('null', 'auto')
+    index.close()
+
+def test_load_config_mmap_file_matches_full_parse(config_file):
+    for load_from_file in ('all', 'required', ['param2', 'param3']):
+        kwargs = dict(required_config_params=['param2'], load_from_file=load_from_file, config_file=config_file)
+        assert load_config(mmap_file=True, **kwargs) == load_config(**kwargs)
+
+def test_load_config_mmap_file_invalid_json(tmp_path):
+    path = tmp_path / 'config.json'
+    path.write_text('{"param1": "file_value1", "param2": "file_value2"')
+    with pytest.raises(ValueError) as e:
+        load_config(config_file=str(path), mmap_file=True) # pragma: no cover
+    assert str(e.value) == f"Invalid JSON in config file: {path}: <string>:1 Unexpected end of input at column 50"
+
+def test_lazy_mmap_file_parses_values_on_access(config_file):
+    config = load_config(config_file=config_file, lazy=True, mmap_file=True)
+    with patch('load_config.file_index.parse_config_text', wraps=parse_config_text) as m:
+        assert config['param3'] == float('-inf')
+        values_parsed = [c.args[0] for c in m.call_args_list if not c.args[0].startswith(('"', "'"))] # not the keys
+        assert values_parsed == ['-Infinity']
+
+def test_load_config_mmap_file_strict_json_rejects_json5(tmp_path):
+    path = tmp_path / 'config.json'
+    path.write_text('{ // c\n a: 1, "b": 2,}')
+    with pytest.raises(ValueError) as mmap_error:
+        load_config(config_file=str(path), parser='json', mmap_file=True)
+    with pytest.raises(ValueError) as error:
+        load_config(config_file=str(path), parser='json')
+    assert str(mmap_error.value) == str(error.value)
+
+def test_load_config_mmap_file_invalid_value_reports_position_in_file(tmp_path):
+    path = tmp_path / 'config.json'
+    path.write_text('{"param1": "file_value1", "p": [1, 2 3]}')
+    with pytest.raises(ValueError) as mmap_error:
+        load_config(config_file=str(path), mmap_file=True)
+    with pytest.raises(ValueError) as error:
+        load_config(config_file=str(path))
+    assert str(mmap_error.value) == str(error.value)
+    assert 'column 38' in str(error.value)
+
+def test_load_config_mmap_file_only_skipped_for_usable_snapshot(config_file):
+    def events(**kwargs):
+        events = []
+        load_config(config_file=config_file, load_from_file=['param2'], mmap_file=True, on_event=lambda event, data: events.append(event), **kwargs)
+        return events
+    main(['snapshot', config_file, '--parser', 'json5'])
+    assert 'snapshot' in events(parser='json5')
+    # a snapshot made with another parser, or of an older version of the file, is not used, so neither is parsing the whole file
+    assert 'index' in events(parser='auto')
+    with open(config_file, 'a') as f:
+        f.write('\n')
+    assert 'index' in events(parser='json5')
@@ -0,0 +1,101 @@
+import pytest
+import os
+import copy
+import pickle
+from load_config import load_config, ConfigLoader, ConfigWatcher, FrozenConfig, freeze
+from load_config.snapshot import encode_config, decode_config
+
+@pytest.fixture
+def config_text():
+    return '{"param1": "file_value1", "db": {"host": "file_host", "ports": [5432, 5433]}, "lookup": {"a": {"b": 1}}}'
+
+def test_frozen_config_is_immutable_and_hashable():
+    config = FrozenConfig({'param1': 'value1', 'db': {'host': 'host', 'ports': [1, 2]}})
+    assert isinstance(config['db'], FrozenConfig)
+    assert config['db']['ports'] == (1, 2)
+    with pytest.raises(TypeError):
+        config['param1'] = 'value2'
+    with pytest.raises(AttributeError):
+        config.x = 1
+    assert hash(config) == hash(FrozenConfig({'db': {'ports': [1, 2], 'host': 'host'}, 'param1': 'value1'}))
+    assert {config: 1}[FrozenConfig(config.thaw())] == 1
+    assert config.thaw() == {'param1': 'value1', 'db': {'host': 'host', 'ports': [1, 2]}}
+
+def test_frozen_config_equality():
+    config = FrozenConfig({'param1': 'value1', 'db': {'host': 'host', 'ports': [1, 2]}})
+    assert config == FrozenConfig({'param1': 'value1', 'db': {'host': 'host', 'ports': [1, 2]}})
+    assert config != FrozenConfig({'param1': 'value1', 'db': {'host': 'other', 'ports': [1, 2]}})
+    assert config == {'param1': 'value1', 'db': {'host': 'host', 'ports': [1, 2]}}
+    assert {'param1': 'value1', 'db': {'host': 'host', 'ports': [1, 2]}} == config
+    assert config != {'param1': 'value1'}
+
+def test_frozen_config_copy_pickle_and_serialize():
+    config = FrozenConfig({'param1': 'value1', 'db': {'host': 'host', 'ports': [1, 2]}})
+    assert copy.deepcopy(config) is config
+    assert pickle.loads(pickle.dumps(config)) == config
+    assert decode_config(encode_config(config)) == config.thaw()
+
+def test_freeze_shares_unchanged_nodes():
+    previous = freeze({'param1': 'value1', 'db': {'host': 'host', 'ports': [1, 2]}, 'lookup': {'a': {'b': 1}}})
+    assert freeze({'param1': 'value1', 'db': {'host': 'host', 'ports': [1, 2]}, 'lookup': {'a': {'b': 1}}}, previous) is previous
+
+    config = freeze({'param1': 'value1', 'db': {'host': 'other', 'ports': [1, 2]}, 'lookup': {'a': {'b': 1}}}, previous)
+    assert config is not previous
+    assert config['lookup'] is previous['lookup']
+    assert config['db']['ports'] is previous['db']['ports']
+    assert config.diff(previous) == {('db', 'host')}
+
+    # equal values of a different type are a change
+    config = freeze({'param1': 'value1', 'db': {'host': 'host', 'ports': [1, 2]}, 'lookup': {'a': {'b': True}}}, previous)
+    assert config['lookup']['a']['b'] is True
+    assert previous.diff(config) == {('lookup', 'a', 'b')}
+
+def test_diff():
+    old = FrozenConfig({'a': 1, 'b': {'c': 2, 'd': 3}, 'e': 4})
+    new = FrozenConfig({'a': 1, 'b': {'c': 2, 'd': 5, 'f': 6}, 'g': 7})
+    assert old.diff(new) == {('b', 'd'), ('b', 'f'), ('e',), ('g',)}
+    assert old.diff(old) == set()
+
+def test_load_frozen_config(config_file):
+    os.environ['DB.HOST'] = 'env_host'
+    config = load_config(required_config_params=['param1', 'db'], config_file=config_file, frozen=True)
+    assert isinstance(config, FrozenConfig)
+    assert config == {'param1': 'file_value1', 'db': {'host': 'env_host'}, 'lookup': {'a': {'b': 1}}}
+
+def test_cached_frozen_config_is_not_copied(config_file):
+    config = load_config(config_file=config_file, cache=True, frozen=True)
+    assert load_config(config_file=config_file, cache=True, frozen=True) is config
+    assert isinstance(load_config(config_file=config_file, cache=True), dict)
+
+def test_frozen_and_lazy_cant_be_combined(config_file):
+    with pytest.raises(ValueError) as e:
+        load_config(config_file=config_file, frozen=True, lazy=True)
+    assert str(e.value) == "frozen and lazy can't be combined"
+
+def test_frozen_loader_reload(config_file):
+    loader = ConfigLoader(config_file=config_file, frozen=True)
+    config = loader.load()
+    assert loader.reload() is config
+    with open(config_file, 'w') as f:
+        f.write('{"param1": "file_value1", "db": {"host": "other_host", "ports": [5432, 5433]}, "lookup": {"a": {"b": 1}}}')
+    changed = loader.reload()
+    assert changed['lookup'] is config['lookup']
+    assert changed.diff(config) == {('db', 'host')}
+
+def test_watcher_with_frozen_loader(config_file):
+    watcher = ConfigWatcher(ConfigLoader(config_file=config_file, frozen=True), debounce=0)
+    with watcher:
+        pass
+    with open(config_file, 'w') as f:
+        f.write('{"param1": "file_value1_changed", "db": {"host": "file_host", "ports": [5432, 5433]}, "lookup": {"a": {"b": 1}}}')
+    assert watcher.check() == {'param1'}
+    assert isinstance(watcher.config, FrozenConfig)
+
+def test_frozen_config_cant_be_initialized_again():
+    config = FrozenConfig({'a': 1})
+    config_hash = hash(config)
+    FrozenConfig.__init__(config, {'a': 2}) # object.__init__, which does nothing
+    with pytest.raises(AttributeError):
+        config._init({'a': 2})
+    assert config == {'a': 1}
+    assert hash(config) == config_hash
@@ -0,0 +1,38 @@
+import os
+from unittest.mock import patch, mock_open
+from load_config import load_config
+
+def test_on_event_reports_phases():
+    mock_json = '{"param1": "file_value1"}'
+    events = []
+    with patch('builtins.open', mock_open(read_data=mock_json), create=True) as m:
+        load_config(on_event=lambda event, data: events.append((event, data)))
+    assert [event for event, _ in events] == ['read', 'parse', 'env_index', 'env_lookup', 'merge', 'loaded']
+    assert all(data['seconds'] >= 0 for event, data in events if event != 'loaded')
+    assert dict(events)['parse']['keys'] == 1
+
+def test_on_event_reports_counts_and_provenance():
+    mock_json = '{"param1": "file_value1", "param2": "file_value2", "param4": "file_value4"}'
+    events = {}
+    with patch('builtins.open', mock_open(read_data=mock_json), create=True) as m:
+        os.environ['PARAM1'] = 'env_value1'
+        os.environ['APPSETTING_PARAM2'] = 'env_value2'
+        os.environ['APPSETTING_PARAM3_KEY1'] = 'env_value3'
+        os.environ['APPSETTING_PARAM3_KEY2'] = 'env_value3'
+        config = load_config(required_config_params=['param1', 'param2', 'param3'], on_event=lambda event, data: events.update({event: data}))
+    assert config['param3'] == {'key1': 'env_value3', 'key2': 'env_value3'}
+    loaded = events['loaded']
+    assert loaded['provenance'] == {'param1': 'env', 'param2': 'azure', 'param3': 'azure', 'param4': 'file'}
+    assert loaded['keys_loaded'] == 4
+    assert loaded['nested_keys'] == 2
+    assert loaded['env_vars_scanned'] == len(os.environ)
+    assert events['env_lookup']['azure_app_services']
+
+def test_on_event_provenance_with_file_priority():
+    mock_json = '{"param1": "file_value1"}'
+    events = {}
+    with patch('builtins.open', mock_open(read_data=mock_json), create=True) as m:
+        os.environ['PARAM1'] = 'env_value1'
+        os.environ['PARAM2.KEY1'] = 'env_value2'
+        load_config(required_config_params=['param1', 'param2'], priority='file', on_event=lambda event, data: events.update({event: data}))
+    assert events['loaded']['provenance'] == {'param1': 'file', 'param2': 'env'}
@@ -0,0 +1,69 @@
+import pytest
+import os
+from unittest.mock import patch
+from load_config import load_config
+from load_config.layers import deep_merge
+from load_config.parser import parse_config_text
+
+@pytest.fixture
+def config_files(tmp_path):
+    base = tmp_path / 'base.json'
+    base.write_text('{"param1": "base_value1", "db": {"host": "base_host", "port": 5432}, "lookup": {"a": 1}}')
+    region = tmp_path / 'region.json'
+    region.write_text('{"db": {"host": "region_host"}}')
+    override = tmp_path / 'override.json'
+    override.write_text('{"PARAM2": "override_value2"}')
+    return [str(base), str(region), str(override)]
+
+def test_deep_merge_shares_unchanged_subtrees():
+    base = {'a': {'x': 1}, 'b': {'y': 1}, 'c': 1}
+    merged = deep_merge(base, {'b': {'z': 2}, 'c': 2})
+    assert merged == {'a': {'x': 1}, 'b': {'y': 1, 'z': 2}, 'c': 2}
+    assert merged['a'] is base['a']
+    assert base == {'a': {'x': 1}, 'b': {'y': 1}, 'c': 1}
+
+def test_load_layered_config_files(config_files):
+    os.environ['PARAM1'] = 'env_value1'
+    config = load_config(required_config_params=['param1'], config_file=config_files)
+    assert config == {
+        'param1': 'env_value1',
+        'db': {'host': 'region_host', 'port': 5432},
+        'lookup': {'a': 1},
+        'param2': 'override_value2',
+    }
+
+def test_only_changed_layer_is_parsed_again(config_files):
+    load_config(config_file=config_files)
+    with open(config_files[2], 'w') as f:
+        f.write('{"param2": "override_value2_changed"}')
+    with patch('load_config.loader.parse_config_text', wraps=parse_config_text) as m:
+        config = load_config(config_file=config_files)
+        m.assert_called_once()
+    assert config['param2'] == 'override_value2_changed'
+    assert config['db'] == {'host': 'region_host', 'port': 5432}
+
+def test_layered_config_is_a_copy(config_files):
+    load_config(config_file=config_files)['db']['host'] = 'modified'
+    assert load_config(config_file=config_files)['db']['host'] == 'region_host'
+
+def test_missing_layer(config_files, tmp_path):
+    missing = str(tmp_path / 'missing.json')
+    with pytest.raises(FileNotFoundError) as e:
+        load_config(config_file=config_files + [missing]) # pragma: no cover
+    assert str(e.value) == f"Config file not found: {missing}"
+    assert load_config(config_file=[missing] + config_files, ignore_missing_file=True)['param1'] == 'base_value1'
+
+def test_layered_config_files_with_cache(config_files):
+    assert load_config(config_file=config_files, cache=True) == load_config(config_file=config_files)
+    with open(config_files[1], 'w') as f:
+        f.write('{"db": {"host": "region_host_changed"}}')
+    assert load_config(config_file=config_files, cache=True)['db']['host'] == 'region_host_changed'
+
+def test_env_vars_are_merged_into_layered_config_files(config_files):
+    os.environ['DB.HOST'] = 'env_host'
+    config = load_config(required_config_params=['db'], config_file=config_files)
+    assert config['db'] == {'host': 'env_host', 'port': 5432}
+    config = load_config(required_config_params=['db'], config_file=config_files, lazy=True)
+    assert config['db'] == {'host': 'env_host', 'port': 5432}
+    config = load_config(required_config_params=['db'], config_file=config_files, priority='file')
+    assert config['db'] == {'host': 'region_host', 'port': 5432}
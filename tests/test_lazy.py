@@ -0,0 +1,64 @@
+import pytest
+import os
+from collections.abc import Mapping
+from unittest.mock import patch, mock_open
+from load_config import load_config
+
+@pytest.fixture
+def config_json(tmp_path, monkeypatch):
+    # the file must exist (it's checked when loading), but its contents come from mock_open
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'config.json').write_text('{}')
+
+def test_lazy_does_not_read_file_for_env_params(config_json):
+    mock_json = '{"param1": "file_value1", "param2": "file_value2"}'
+    with patch('builtins.open', mock_open(read_data=mock_json), create=True) as m:
+        os.environ['PARAM1'] = 'env_value1'
+        config = load_config(required_config_params=['param1'], lazy=True)
+        assert isinstance(config, Mapping)
+        assert config['param1'] == 'env_value1'
+        m.assert_not_called()
+        assert config['param2'] == 'file_value2'
+        assert config.get('param3') is None
+        m.assert_called_once_with('config.json')
+
+def test_lazy_matches_eager_config(config_json):
+    mock_json = '{"param1": "file_value1", "param2": "file_value2", "param3.key1": "file_value3"}'
+    with patch('builtins.open', mock_open(read_data=mock_json), create=True) as m:
+        os.environ['APPSETTING_PARAM2'] = 'env_value2'
+        os.environ['APPSETTING_PARAM3_KEY1'] = 'env_value3'
+        os.environ['APPSETTING_PARAM4_KEY1'] = 'env_value4'
+        for priority in ('env', 'file'):
+            kwargs = dict(required_config_params=['param1', 'param2', 'param3.key1', 'param4'], priority=priority)
+            lazy_config = load_config(lazy=True, **kwargs)
+            assert lazy_config == load_config(**kwargs)
+            assert list(lazy_config) == list(load_config(**kwargs))
+            assert len(lazy_config) == 4
+
+def test_lazy_checks_required_params_eagerly(config_json):
+    mock_json = '{"param1": "file_value1"}'
+    with patch('builtins.open', mock_open(read_data=mock_json), create=True) as m:
+        with pytest.raises(SystemExit) as e:
+            load_config(required_config_params=['param1', 'param2'], lazy=True) # pragma: no cover
+        assert str(e.value) == "1"
+
+def test_lazy_config_is_read_only(config_json):
+    mock_json = '{"param1": "file_value1"}'
+    with patch('builtins.open', mock_open(read_data=mock_json), create=True) as m:
+        config = load_config(lazy=True)
+        with pytest.raises(TypeError):
+            config['param1'] = 'new_value'
+
+def test_lazy_and_cache_cannot_be_combined():
+    with pytest.raises(ValueError) as e:
+        load_config(lazy=True, cache=True) # pragma: no cover
+    assert str(e.value) == "cache and lazy can't be combined"
+
+def test_lazy_checks_missing_file_eagerly(tmp_path):
+    missing = str(tmp_path / 'missing.json')
+    with pytest.raises(FileNotFoundError) as e:
+        load_config(config_file=missing, lazy=True)
+    assert str(e.value) == f"Config file not found: {missing}"
+    with pytest.raises(FileNotFoundError):
+        load_config(config_file=[missing], lazy=True)
+    assert load_config(config_file=missing, ignore_missing_file=True, lazy=True).get('param1', 'default') == 'default'
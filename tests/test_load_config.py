@@ -5,13 +5,6 @@ from load_config import load_config
 
 # WARNING: when running all tests at once, keep in mind the os.environ is global and will be modified by the tests
 
-@pytest.fixture(autouse=True)
-def isolate_environment_variables():
-    original_environ = os.environ.copy()
-    yield
-    os.environ.clear()
-    os.environ.update(original_environ)
-
 def test_priority_env():
     mock_json = '{"param1": "file_value1", "param2": "file_value2"}'
     with patch('builtins.open', mock_open(read_data=mock_json), create=True) as m:
@@ -229,4 +222,44 @@ def test_load_config_json_with_comments():
         assert config['param1'] == 'file_value1'
         assert config['param2'] == 'file_value2'
 
+def test_load_multi_level_nested_env_vars():
+    mock_json = '{}'
+    with patch('builtins.open', mock_open(read_data=mock_json), create=True) as m:
+        os.environ['PREFIX130_PARAM130.KEY1.SUB1'] = 'env_value1'
+        os.environ['PREFIX130_PARAM130.KEY1.SUB2'] = 'env_value2'
+        os.environ['PREFIX130_PARAM130.KEY2'] = 'env_value3'
+        config = load_config(required_config_params=["param130"], config_env_prefix='PREFIX130_')
+        m.assert_called_once_with('config.json')
+        assert config['param130'] == {'key1': {'sub1': 'env_value1', 'sub2': 'env_value2'}, 'key2': 'env_value3'}
+
+def test_load_config_strict_json_skips_json5():
+    mock_json = '{"param1": "file_value1", "param2": "file_value2"}'
+    with patch('builtins.open', mock_open(read_data=mock_json), create=True) as m:
+        with patch('load_config.parser.json5.loads') as json5_loads:
+            config = load_config()
+            json5_loads.assert_not_called()
+        assert config['param1'] == 'file_value1'
+
+def test_load_config_forced_json_parser_rejects_json5():
+    mock_json = '{"param1": "file_value1", /* comment */ }'
+    with patch('builtins.open', mock_open(read_data=mock_json), create=True) as m:
+        with pytest.raises(ValueError) as e:
+            load_config(parser='json') # pragma: no cover
+        assert str(e.value).startswith("Invalid JSON in config file: config.json: ")
+        assert load_config(parser='json5')['param1'] == 'file_value1'
+
+def test_load_config_large_integers_are_exact():
+    mock_json = '{"big": 123456789012345678901234567890, "negative": -9999999999999999999, "param1": "file_value1"}'
+    with patch('builtins.open', mock_open(read_data=mock_json), create=True) as m:
+        for parser in ('auto', 'json', 'json5'):
+            config = load_config(parser=parser)
+            assert config['big'] == 123456789012345678901234567890
+            assert config['negative'] == -9999999999999999999
+            assert isinstance(config['big'], int)
+
+def test_invalid_parser():
+    with pytest.raises(ValueError) as e:
+        load_config(parser='invalid') # pragma: no cover
+    assert str(e.value) == "parser must be 'auto', 'json' or 'json5'"
+
 # WARNING: when running all tests at once, keep in mind the os.environ is global and will be modified by the tests
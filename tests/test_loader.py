@@ -0,0 +1,36 @@
+import pytest
+import os
+from unittest.mock import patch, mock_open
+from load_config import ConfigLoader, MissingConfigParameterError
+
+def test_loader_load_returns_loaded_config():
+    mock_json = '{"param1": "file_value1"}'
+    with patch('builtins.open', mock_open(read_data=mock_json), create=True) as m:
+        loader = ConfigLoader(required_config_params=['param1'])
+        config = loader.load()
+        assert loader.load() is config
+        m.assert_called_once_with('config.json')
+        assert config == {'param1': 'file_value1'}
+
+def test_loader_reload_picks_up_changes():
+    mock_json = '{"param1": "file_value1"}'
+    with patch('builtins.open', mock_open(read_data=mock_json), create=True) as m:
+        loader = ConfigLoader(required_config_params=['PARAM1', 'param2.key1'], ignore_missing_file=True, azure_app_services=True)
+        os.environ['APPSETTING_PARAM2_KEY1'] = 'env_value1'
+        assert loader.load() == {'param1': 'file_value1', 'param2.key1': 'env_value1'}
+        os.environ['PARAM1'] = 'env_value1'
+        os.environ['APPSETTING_PARAM2_KEY1'] = 'env_value2'
+        assert loader.reload() == {'param1': 'env_value1', 'param2.key1': 'env_value2'}
+        assert m.call_count == 2
+
+def test_loader_validates_arguments_once():
+    with pytest.raises(ValueError) as e:
+        ConfigLoader(priority='invalid')
+    assert str(e.value) == "priority must be 'env' or 'file'"
+
+def test_loader_raise_on_missing():
+    loader = ConfigLoader(required_config_params=['param1'], ignore_missing_file=True, raise_on_missing=True)
+    with pytest.raises(MissingConfigParameterError) as e:
+        loader.load()
+    assert e.value.param == 'param1'
+    assert str(e.value) == "Missing required config parameter: param1. It can be set either as an environment variable (as PARAM1) or in config.json (as param1)."
@@ -0,0 +1,134 @@
+import pytest
+import os
+from unittest.mock import patch
+from load_config import load_config, ConfigLoader, ConfigWatcher
+from load_config.secret_dirs import read_secret_dir, secret_dir_fingerprint, _read_secret
+
+@pytest.fixture
+def config_text():
+    return '{"param1": "file_value1", "db": {"host": "file_host"}}'
+
+def _kubernetes_secret_volume(path, secrets, version):
+    # the layout of a Kubernetes secret volume: the files are in a timestamped directory, which the ..data symlink
+    # points to, and each secret is a symlink through ..data
+    path.mkdir(exist_ok=True)
+    data_dir = path / f'..2024_01_01_00_00_0{version}'
+    data_dir.mkdir()
+    for name, value in secrets.items():
+        (data_dir / name).write_text(value)
+    os.symlink(data_dir.name, path / '..data_tmp')
+    os.replace(path / '..data_tmp', path / '..data')
+    for name in secrets:
+        if not os.path.lexists(path / name):
+            os.symlink(f'..data/{name}', path / name)
+
+def test_read_secret_dir(tmp_path):
+    (tmp_path / 'param1').write_text('secret1\n')
+    (tmp_path / 'db.password').write_text('secret2')
+    (tmp_path / '.hidden').write_text('hidden')
+    (tmp_path / 'subdir').mkdir()
+    assert read_secret_dir(str(tmp_path)) == {'param1': 'secret1', 'db.password': 'secret2'}
+    assert read_secret_dir(str(tmp_path / 'missing')) == {}
+
+def test_read_large_secret_dir_concurrently(tmp_path):
+    for i in range(100):
+        (tmp_path / f'param{i}').write_text(f'secret{i}')
+    assert read_secret_dir(str(tmp_path)) == {f'param{i}': f'secret{i}' for i in range(100)}
+
+def test_load_secrets_like_env_vars(tmp_path, config_file):
+    (tmp_path / 'secrets').mkdir()
+    (tmp_path / 'secrets' / 'PARAM1').write_text('secret_value1\n')
+    (tmp_path / 'secrets' / 'db.password').write_text('secret_password')
+    (tmp_path / 'secrets' / 'db.user').write_text('secret_user')
+    (tmp_path / 'secrets' / 'unused').write_text('unused')
+    config = load_config(required_config_params=['param1', 'db'], config_file=config_file, secret_dirs=str(tmp_path / 'secrets'))
+    # as with env.vars, the nested secrets replace the dictionary from the config file
+    assert config == {'param1': 'secret_value1', 'db': {'password': 'secret_password', 'user': 'secret_user'}}
+
+def test_env_vars_override_secrets(tmp_path, config_file):
+    (tmp_path / 'secrets').mkdir()
+    (tmp_path / 'secrets' / 'param1').write_text('secret_value1')
+    (tmp_path / 'secrets' / 'param2').write_text('secret_value2')
+    os.environ['PARAM1'] = 'env_value1'
+    config = load_config(load_from_env='all', config_file=config_file, secret_dirs=[str(tmp_path / 'secrets')])
+    assert config['param1'] == 'env_value1'
+    assert config['param2'] == 'secret_value2'
+
+def test_later_secret_dirs_override_earlier_ones(tmp_path, config_file):
+    (tmp_path / 'a').mkdir()
+    (tmp_path / 'a' / 'param1').write_text('a_value1')
+    (tmp_path / 'b').mkdir()
+    (tmp_path / 'b' / 'param1').write_text('b_value1')
+    config = load_config(required_config_params=['param1'], config_file=config_file, secret_dirs=[str(tmp_path / 'a'), str(tmp_path / 'b'), str(tmp_path / 'missing')])
+    assert config['param1'] == 'b_value1'
+
+def test_secrets_with_env_prefix(tmp_path, config_file):
+    (tmp_path / 'param1').write_text('secret_value1')
+    config = load_config(required_config_params=['param1'], config_file=config_file, config_env_prefix='PREFIX_', secret_dirs=str(tmp_path))
+    assert config['param1'] == 'secret_value1'
+
+def test_unchanged_secret_dir_is_not_read_again(tmp_path, config_file):
+    secrets = tmp_path / 'secrets'
+    _kubernetes_secret_volume(secrets, {'param1': 'secret_value1'}, 1)
+    loader = ConfigLoader(required_config_params=['param1'], config_file=config_file, secret_dirs=str(secrets))
+    assert loader.reload()['param1'] == 'secret_value1'
+    with patch('load_config.secret_dirs._read_secret', wraps=_read_secret) as m:
+        assert loader.reload()['param1'] == 'secret_value1'
+        m.assert_not_called()
+        fingerprint = secret_dir_fingerprint(str(secrets))
+        # Kubernetes updates the secrets by swapping the ..data symlink
+        _kubernetes_secret_volume(secrets, {'param1': 'secret_value1_changed'}, 2)
+        assert secret_dir_fingerprint(str(secrets)) != fingerprint
+        assert loader.reload()['param1'] == 'secret_value1_changed'
+        m.assert_called_once()
+
+def test_cached_load_config_picks_up_changed_secrets(tmp_path, config_file):
+    secrets = tmp_path / 'secrets'
+    _kubernetes_secret_volume(secrets, {'param1': 'secret_value1'}, 1)
+    assert load_config(required_config_params=['param1'], config_file=config_file, secret_dirs=str(secrets), cache=True)['param1'] == 'secret_value1'
+    _kubernetes_secret_volume(secrets, {'param1': 'secret_value1_changed'}, 2)
+    assert load_config(required_config_params=['param1'], config_file=config_file, secret_dirs=str(secrets), cache=True)['param1'] == 'secret_value1_changed'
+
+def test_lazy_config_with_secrets(tmp_path, config_file):
+    (tmp_path / 'param2').write_text('secret_value2')
+    config = load_config(load_from_env=['param2'], config_file=config_file, secret_dirs=str(tmp_path), lazy=True)
+    assert config['param2'] == 'secret_value2'
+    assert config['param1'] == 'file_value1'
+
+def test_watcher_reloads_changed_secrets(tmp_path, config_file):
+    secrets = tmp_path / 'secrets'
+    _kubernetes_secret_volume(secrets, {'param1': 'secret_value1'}, 1)
+    watcher = ConfigWatcher(ConfigLoader(required_config_params=['param1'], config_file=config_file, secret_dirs=str(secrets)), debounce=0)
+    with watcher:
+        pass
+    _kubernetes_secret_volume(secrets, {'param1': 'secret_value1_changed'}, 2)
+    assert watcher.check() == {'param1'}
+    assert watcher.config['param1'] == 'secret_value1_changed'
+
+def test_secret_provenance(tmp_path, config_file):
+    (tmp_path / 'secrets').mkdir()
+    (tmp_path / 'secrets' / 'param1').write_text('secret_value1')
+    (tmp_path / 'secrets' / 'param2').write_text('secret_value2')
+    (tmp_path / 'secrets' / 'db.password').write_text('secret_password')
+    os.environ['PARAM2'] = 'env_value2'
+    events = []
+    load_config(required_config_params=['param1', 'param2', 'db'], config_file=config_file, secret_dirs=str(tmp_path / 'secrets'),
+                on_event=lambda event, data: events.append((event, data)))
+    provenance = dict(events)['loaded']['provenance']
+    assert provenance == {'param1': 'secret', 'param2': 'env', 'db': 'secret'}
+
+def test_dotted_secrets_in_azure(tmp_path, config_file):
+    (tmp_path / 'secrets').mkdir()
+    (tmp_path / 'secrets' / 'db.password').write_text('secret_password')
+    (tmp_path / 'secrets' / 'db.user').write_text('secret_user')
+    os.environ['APPSETTING_DB_USER'] = 'azure_user'
+    events = []
+    config = load_config(required_config_params=['db'], config_file=config_file, secret_dirs=str(tmp_path / 'secrets'),
+                         on_event=lambda event, data: events.append((event, data)))
+    assert config['db'] == {'password': 'secret_password', 'user': 'azure_user'}
+    del os.environ['APPSETTING_DB_USER']
+    os.environ['APPSETTING_OTHER'] = 'value'
+    config = load_config(required_config_params=['db'], config_file=config_file, secret_dirs=str(tmp_path / 'secrets'),
+                         on_event=lambda event, data: events.append((event, data)))
+    assert config['db'] == {'password': 'secret_password', 'user': 'secret_user'}
+    assert events[-1][1]['provenance']['db'] == 'secret'
@@ -0,0 +1,45 @@
+import pytest
+import uuid
+import multiprocessing
+from load_config import ConfigPublisher, SharedConfig, FrozenConfig
+
+@pytest.fixture
+def name():
+    return f"load_config_test_{uuid.uuid4().hex[:8]}"
+
+def _read_in_worker(name, queue):
+    queue.put(SharedConfig(name).config)
+
+def test_shared_config_in_same_process(name):
+    with ConfigPublisher(name) as publisher:
+        shared = SharedConfig(name)
+        assert shared.config is None
+        publisher.publish({'param1': 'value1', 'nested': {'key1': [1, 2.5, None]}})
+        config = shared.config
+        assert config == {'param1': 'value1', 'nested': {'key1': [1, 2.5, None]}}
+        assert shared.config is config # not deserialized again if nothing changed
+        assert isinstance(config, FrozenConfig)
+        with pytest.raises(TypeError):
+            config['param1'] = 'modified'
+        publisher.publish({'param1': 'value2'})
+        assert shared.config == {'param1': 'value2'}
+        assert shared.generation == 2
+        shared.close()
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='needs fork')
+def test_shared_config_in_forked_worker(name):
+    with ConfigPublisher(name) as publisher:
+        publisher.publish({'param1': 'value1'})
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue()
+        worker = context.Process(target=_read_in_worker, args=(name, queue))
+        worker.start()
+        assert queue.get(timeout=10) == {'param1': 'value1'}
+        worker.join()
+        assert worker.exitcode == 0
+        # the worker exiting must not remove the published config
+        assert SharedConfig(name).config == {'param1': 'value1'}
+
+def test_shared_config_not_published(name):
+    with pytest.raises(FileNotFoundError):
+        SharedConfig(name)
@@ -0,0 +1,69 @@
+import pytest
+import os
+from unittest.mock import patch
+from load_config import load_config
+from load_config.__main__ import main
+from load_config.snapshot import MAGIC, snapshot_path, read_snapshot
+
+@pytest.fixture
+def config_text():
+    return '{\n  // comment\n  "Param1": "file_value1",\n  param2: {"key1": [1, 2.5, null, true]},\n}'
+
+def test_snapshot_cli_writes_snapshot(config_file, capsys):
+    assert main(['snapshot', config_file]) == 0
+    assert capsys.readouterr().out.strip() == snapshot_path(config_file)
+    assert read_snapshot(config_file) == {'Param1': 'file_value1', 'param2': {'key1': [1, 2.5, None, True]}}
+
+def test_load_config_uses_snapshot(config_file):
+    expected = load_config(config_file=config_file)
+    main(['snapshot', config_file])
+    with patch('load_config.loader.parse_config_text') as m:
+        assert load_config(config_file=config_file) == expected
+        m.assert_not_called()
+
+def test_load_config_ignores_outdated_snapshot(config_file):
+    main(['snapshot', config_file])
+    with open(config_file, 'w') as f:
+        f.write('{"param1": "file_value1_changed"}')
+    assert read_snapshot(config_file) is None
+    assert load_config(config_file=config_file) == {'param1': 'file_value1_changed'}
+
+def test_snapshot_cli_rejects_invalid_config(tmp_path, capsys):
+    path = tmp_path / 'config.json'
+    path.write_text('{"param1": ')
+    assert main(['snapshot', str(path)]) == 1
+    assert capsys.readouterr().err.startswith(f"Invalid JSON in config file: {path}: ")
+    assert not os.path.exists(snapshot_path(str(path)))
+
+def test_snapshot_only_used_with_same_parser(config_file):
+    main(['snapshot', config_file])
+    assert read_snapshot(config_file, 'json') is None
+    # the config file is JSON5, so strict parsing still rejects it
+    with pytest.raises(ValueError) as e:
+        load_config(config_file=config_file, parser='json')
+    assert str(e.value).startswith(f"Invalid JSON in config file: {config_file}: ")
+    main(['snapshot', config_file, '--parser', 'json5'])
+    with patch('load_config.loader.parse_config_text') as m:
+        assert load_config(config_file=config_file, parser='json5')['param1'] == 'file_value1'
+        m.assert_not_called()
+
+def test_snapshot_keeps_large_integers_exact(tmp_path):
+    path = tmp_path / 'config.json'
+    path.write_text('{"big": 123456789012345678901234567890, "nan": NaN}')
+    main(['snapshot', str(path)])
+    snapshot = read_snapshot(str(path))
+    assert snapshot['big'] == 123456789012345678901234567890
+    assert isinstance(snapshot['big'], int)
+    assert snapshot['nan'] != snapshot['nan']
+
+def test_damaged_snapshot_is_ignored(config_file):
+    expected = load_config(config_file=config_file)
+    main(['snapshot', config_file])
+    with open(snapshot_path(config_file), 'rb') as f:
+        data = f.read()
+    # only the header, and a truncated payload (with a matching hash of the config file)
+    for damaged in (MAGIC, data[:-5]):
+        with open(snapshot_path(config_file), 'wb') as f:
+            f.write(damaged)
+        assert read_snapshot(config_file) is None
+        assert load_config(config_file=config_file) == expected
@@ -0,0 +1,83 @@
+import pytest
+import os
+import time
+import threading
+from load_config import ConfigLoader, ConfigWatcher
+from load_config.watcher import diff_configs
+
+@pytest.fixture
+def config_text():
+    return '{"param1": "file_value1", "param2": "file_value2"}'
+
+def test_diff_configs():
+    assert diff_configs({'a': 1, 'b': {'c': 2}, 'd': 3}, {'a': 1, 'b': {'c': 3}, 'e': 4}) == {'b', 'd', 'e'}
+
+def test_watcher_check_reports_changed_keys(config_file):
+    os.environ['PARAM1'] = 'env_value1'
+    watcher = ConfigWatcher(ConfigLoader(required_config_params=['param1'], config_file=config_file), debounce=0)
+    with watcher:
+        pass
+    calls = []
+    watcher.add_callback(lambda changed, config: calls.append((changed, config)))
+    assert watcher.check() == set()
+    with open(config_file, 'w') as f:
+        f.write('{"param1": "file_value1_changed", "param2": "file_value2_changed", "param3": "file_value3"}')
+    # param1 comes from the environment (priority='env'), so it did not change
+    assert watcher.check() == {'param2', 'param3'}
+    assert calls == [({'param2', 'param3'}, watcher.config)]
+    assert watcher.config['param1'] == 'env_value1'
+
+def test_watcher_keeps_config_on_invalid_file(config_file):
+    watcher = ConfigWatcher(ConfigLoader(config_file=config_file), debounce=0)
+    with watcher:
+        pass
+    with open(config_file, 'w') as f:
+        f.write('{"param1": ')
+    assert watcher.check() == set()
+    assert watcher.config == {'param1': 'file_value1', 'param2': 'file_value2'}
+
+def test_watcher_thread_calls_callbacks(config_file):
+    changes = threading.Event()
+    with ConfigWatcher(ConfigLoader(config_file=config_file), interval=0.05, debounce=0.01) as watcher:
+        watcher.add_callback(lambda changed, config: changes.set())
+        time.sleep(0.05)
+        with open(config_file, 'w') as f:
+            f.write('{"param1": "file_value1_changed"}')
+        assert changes.wait(5)
+        assert watcher.config == {'param1': 'file_value1_changed'}
+
+def test_concurrent_checks_report_a_change_once(config_file):
+    watcher = ConfigWatcher(ConfigLoader(config_file=config_file), debounce=0.05)
+    watcher.config = watcher.loader.reload()
+    watcher._fingerprint = watcher._source_fingerprint()
+    reload = watcher.loader.reload
+    reloads = []
+    watcher.loader.reload = lambda: reloads.append(1) or reload()
+    calls = []
+    watcher.add_callback(lambda changed, config: calls.append(changed))
+    with open(config_file, 'w') as f:
+        f.write('{"param1": "file_value1_changed", "param2": "file_value2"}')
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(watcher.check())) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(results, key=len) == [set(), {'param1'}]
+    assert calls == [{'param1'}]
+    assert reloads == [1]
+
+def test_stop_interrupts_debounce_without_reloading(config_file):
+    reloads = []
+    loader = ConfigLoader(config_file=config_file)
+    watcher = ConfigWatcher(loader, interval=0.01, debounce=10, use_inotify=False)
+    with watcher:
+        reload = loader.reload
+        loader.reload = lambda: reloads.append(1) or reload()
+        with open(config_file, 'w') as f:
+            f.write('{"param1": "file_value1_changed"}')
+        time.sleep(0.2) # the watcher thread is now waiting for the file to stop changing
+        start = time.monotonic()
+    assert time.monotonic() - start < 5
+    assert reloads == []
+    assert watcher.config == {'param1': 'file_value1', 'param2': 'file_value2'}